@@ -19,6 +19,8 @@ _VALID_PROPOSITION_STATUSES = {
     "merged",
 }
 
+_RENDERED_PROMPT_CACHE_SIZE = 64
+
 
 class DesignerAgent:
     def __init__(self, llm: LLMClient, max_sections: int = 8):
@@ -26,6 +28,7 @@ class DesignerAgent:
         self.max_sections = max_sections
         self._system_prompts: dict[str, str] = {}
         self._interviewer_prompts: dict[str, str] = {}
+        self._rendered_interviewer_prompts: dict[tuple[str, int, str], str] = {}
 
     def _get_system_prompt(self, language: str = "en") -> str:
         if language not in self._system_prompts:
@@ -159,6 +162,20 @@ class DesignerAgent:
         )
 
     def build_interviewer_prompt(self, script: InterviewScript, language: str = "en") -> str:
+        # Keyed on the full script content, so an edited script with a reused version
+        # number never gets a stale prompt.
+        key = (language, script.version, script.model_dump_json())
+        cached = self._rendered_interviewer_prompts.get(key)
+        if cached is not None:
+            return cached
+
+        rendered = self._render_interviewer_prompt(script, language)
+        if len(self._rendered_interviewer_prompts) >= _RENDERED_PROMPT_CACHE_SIZE:
+            self._rendered_interviewer_prompts.pop(next(iter(self._rendered_interviewer_prompts)))
+        self._rendered_interviewer_prompts[key] = rendered
+        return rendered
+
+    def _render_interviewer_prompt(self, script: InterviewScript, language: str) -> str:
         topic_blocks = []
         probe_lines = []
         for section in script.sections[: self.max_sections]:
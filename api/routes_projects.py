@@ -3,6 +3,7 @@ from __future__ import annotations
 import io
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from uuid import uuid4
 
@@ -596,6 +597,18 @@ async def stop_project(
     }
 
 
+@lru_cache(maxsize=256)
+def _render_qr_png(link: str) -> bytes:
+    qr = qrcode.QRCode(border=2, box_size=8)
+    qr.add_data(link)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
 @router.get("/{project_id}/qrcode", status_code=status.HTTP_200_OK)
 def get_qrcode(
     project_id: str,
@@ -614,14 +627,7 @@ def get_qrcode(
     if not talk_to_link:
         raise HTTPException(status_code=400, detail="talk_to_link is not available for this project")
 
-    qr = qrcode.QRCode(border=2, box_size=8)
-    qr.add_data(talk_to_link)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return Response(content=buf.getvalue(), media_type="image/png")
+    return Response(content=_render_qr_png(talk_to_link), media_type="image/png")
 
 
 @router.get("/{project_id}/visualization/hypothesis-map", status_code=status.HTTP_200_OK)
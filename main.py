@@ -85,6 +85,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    project_service.close()
+
 
 app = FastAPI(title="Eidetic API", version="0.1.0", lifespan=lifespan)
 
@@ -26,6 +26,13 @@ def main() -> int:
         raise SystemExit(f"Project file not found: {project_path}")
 
     payload = json.loads(project_path.read_text(encoding="utf-8"))
+    wal_path = project_path.with_name("project.wal")
+    if wal_path.exists():
+        for line in wal_path.read_text(encoding="utf-8").splitlines():
+            try:
+                payload.update(json.loads(line))
+            except json.JSONDecodeError:
+                break
     if args.full:
         print(json.dumps(payload, ensure_ascii=False, indent=2))
         return 0
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -17,10 +20,29 @@ class ProjectAlreadyExistsError(FileExistsError):
     pass
 
 
+@dataclass
+class _PersistedState:
+    """Last payload known to be on disk, plus the file stamps it was observed with."""
+
+    payload: dict[str, Any]
+    wal_entries: int
+    stamps: tuple[int, int, int]
+
+
 class ProjectService:
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, wal_compact_every: int = 32):
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.wal_compact_every = max(1, wal_compact_every)
+        self._persisted: dict[str, _PersistedState] = {}
+        # Routes and pipeline background tasks save from different threads; the
+        # delta/append/remember steps for one project must not interleave.
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _project_lock(self, project_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(project_id, threading.Lock())
 
     def _project_dir(self, project_id: str) -> Path:
         return self.data_dir / project_id
@@ -28,6 +50,9 @@ class ProjectService:
     def _project_file(self, project_id: str) -> Path:
         return self._project_dir(project_id) / "project.json"
 
+    def _wal_file(self, project_id: str) -> Path:
+        return self._project_dir(project_id) / "project.wal"
+
     def _interviews_dir(self, project_id: str) -> Path:
         return self._project_dir(project_id) / "interviews"
 
@@ -64,8 +89,11 @@ class ProjectService:
         project_file = self._project_file(project_id)
         if not project_file.exists():
             raise ProjectNotFoundError(f"Project '{project_id}' not found")
-        with project_file.open("r", encoding="utf-8") as f:
-            payload = json.load(f)
+        with self._project_lock(project_id):
+            with project_file.open("r", encoding="utf-8") as f:
+                payload = json.load(f)
+            wal_entries = self._replay_wal(project_id, payload)
+            self._remember(project_id, payload, wal_entries)
         return ProjectState.model_validate(payload)
 
     def save_project(self, project: ProjectState) -> None:
@@ -75,8 +103,112 @@ class ProjectService:
         self._scripts_dir(project.id).mkdir(parents=True, exist_ok=True)
 
         project.updated_at = utc_now()
-        with self._project_file(project.id).open("w", encoding="utf-8") as f:
-            json.dump(project.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+        payload = project.model_dump(mode="json")
+        with self._project_lock(project.id):
+            if not self._project_file(project.id).exists():
+                self._write_snapshot(project.id, payload)
+                return
+
+            # Only top-level fields that differ from what is on disk go to the WAL. When
+            # the on-disk state is unknown or was changed behind our back, log the full
+            # payload so replay stays correct.
+            persisted = self._persisted.get(project.id)
+            if persisted is None or not self._stamps_match(project.id, persisted):
+                delta = payload
+                wal_entries = self._count_wal_entries(project.id)
+            else:
+                delta = {k: v for k, v in payload.items() if persisted.payload.get(k) != v}
+                wal_entries = persisted.wal_entries
+
+            self._append_wal(project.id, delta)
+            wal_entries += 1
+
+            if wal_entries >= self.wal_compact_every:
+                self._write_snapshot(project.id, payload)
+            else:
+                self._remember(project.id, payload, wal_entries)
+
+    def compact(self, project_id: str) -> None:
+        if not self._wal_file(project_id).exists():
+            return
+        project_file = self._project_file(project_id)
+        with self._project_lock(project_id):
+            with project_file.open("r", encoding="utf-8") as f:
+                payload = json.load(f)
+            self._replay_wal(project_id, payload)
+            self._write_snapshot(project_id, payload)
+
+    def close(self) -> None:
+        for project_id in self.list_projects():
+            if self._wal_file(project_id).exists() and self.exists(project_id):
+                self.compact(project_id)
+
+    def _write_snapshot(self, project_id: str, payload: dict[str, Any]) -> None:
+        # Replace the snapshot before dropping the WAL: if we crash in between, the
+        # WAL replays onto a snapshot that already holds its final values.
+        project_file = self._project_file(project_id)
+        tmp_file = project_file.with_suffix(".json.tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, project_file)
+        self._wal_file(project_id).unlink(missing_ok=True)
+        self._remember(project_id, payload, 0)
+
+    def _append_wal(self, project_id: str, delta: dict[str, Any]) -> None:
+        line = json.dumps(delta, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._wal_file(project_id).open("a+b") as f:
+            # After a torn write the file does not end in a newline; start a fresh line
+            # so the new entry is not glued onto the partial one.
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+
+    def _replay_wal(self, project_id: str, payload: dict[str, Any]) -> int:
+        wal_file = self._wal_file(project_id)
+        if not wal_file.exists():
+            return 0
+        entries = 0
+        with wal_file.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    delta = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write from an interrupted save; later entries still apply.
+                    continue
+                payload.update(delta)
+                entries += 1
+        return entries
+
+    def _count_wal_entries(self, project_id: str) -> int:
+        wal_file = self._wal_file(project_id)
+        if not wal_file.exists():
+            return 0
+        with wal_file.open("rb") as f:
+            return sum(1 for _ in f)
+
+    def _remember(self, project_id: str, payload: dict[str, Any], wal_entries: int) -> None:
+        self._persisted[project_id] = _PersistedState(
+            payload=payload,
+            wal_entries=wal_entries,
+            stamps=self._file_stamps(project_id),
+        )
+
+    def _stamps_match(self, project_id: str, persisted: _PersistedState) -> bool:
+        return self._file_stamps(project_id) == persisted.stamps
+
+    def _file_stamps(self, project_id: str) -> tuple[int, int, int]:
+        try:
+            snapshot_stat = self._project_file(project_id).stat()
+            snapshot_stamp = (snapshot_stat.st_mtime_ns, snapshot_stat.st_size)
+        except FileNotFoundError:
+            snapshot_stamp = (-1, -1)
+        try:
+            wal_size = self._wal_file(project_id).stat().st_size
+        except FileNotFoundError:
+            wal_size = 0
+        return (*snapshot_stamp, wal_size)
 
     def delete_project(self, project_id: str) -> None:
         project_dir = self._project_dir(project_id)
@@ -88,6 +220,7 @@ class ProjectService:
             elif path.is_dir():
                 path.rmdir()
         project_dir.rmdir()
+        self._persisted.pop(project_id, None)
 
     def next_interview_id(self, project: ProjectState) -> str:
         return f"INT_{len(project.interview_store) + 1:03d}"
@@ -101,14 +234,12 @@ class ProjectService:
     def add_interview(self, project: ProjectState, interview: Interview) -> None:
         project.interview_store.append(interview)
         filename = self._interviews_dir(project.id) / f"{interview.id}.json"
-        with filename.open("w", encoding="utf-8") as f:
-            json.dump(interview.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+        filename.write_text(interview.model_dump_json(indent=2), encoding="utf-8")
 
     def add_script(self, project: ProjectState, script: InterviewScript) -> None:
         project.script_versions.append(script)
         filename = self._scripts_dir(project.id) / f"script_v{script.version}.json"
-        with filename.open("w", encoding="utf-8") as f:
-            json.dump(script.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+        filename.write_text(script.model_dump_json(indent=2), encoding="utf-8")
 
     def list_projects(self) -> list[str]:
         return sorted([p.name for p in self.data_dir.iterdir() if p.is_dir()])
@@ -1,20 +1,62 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Any
 
 
+DEFAULT_SUBSCRIBER_MAXSIZE = 256
+
+
+class SubscriberQueue:
+    """Single-consumer event buffer: a deque plus an event that is set while items are pending.
+
+    The buffer is bounded; once full, each new event evicts the oldest one so a slow
+    dashboard client cannot grow memory without limit.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SUBSCRIBER_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._items: deque[dict[str, Any]] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put_nowait(self, item: dict[str, Any]) -> None:
+        self._items.append(item)
+        self._ready.set()
+
+    def get_nowait(self) -> dict[str, Any]:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        if not self._items:
+            self._ready.clear()
+        return item
+
+    async def get(self) -> dict[str, Any]:
+        while not self._items:
+            await self._ready.wait()
+        return self.get_nowait()
+
+
 class SSEManager:
     def __init__(self) -> None:
-        self.subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self.subscribers: dict[str, set[SubscriberQueue]] = defaultdict(set)
 
-    def subscribe(self, project_id: str) -> asyncio.Queue:
-        queue: asyncio.Queue = asyncio.Queue()
+    def subscribe(self, project_id: str, maxsize: int = DEFAULT_SUBSCRIBER_MAXSIZE) -> SubscriberQueue:
+        queue = SubscriberQueue(maxsize=maxsize)
         self.subscribers[project_id].add(queue)
         return queue
 
-    def unsubscribe(self, project_id: str, queue: asyncio.Queue) -> None:
+    def unsubscribe(self, project_id: str, queue: SubscriberQueue) -> None:
         self.subscribers[project_id].discard(queue)
         if not self.subscribers[project_id]:
             self.subscribers.pop(project_id, None)
@@ -24,4 +66,4 @@ class SSEManager:
             return
         message = {"event": event_type, "data": data}
         for queue in list(self.subscribers[project_id]):
-            await queue.put(message)
+            queue.put_nowait(message)
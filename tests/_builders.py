@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any
+
+from models.evidence import Evidence
+from models.interview import Interview
+from models.proposition import Proposition
+from models.script import ScriptSection
+
+
+_BASE_PROPOSITION = Proposition(
+    id="P001",
+    factor="team dynamics",
+    mechanism="alignment",
+    outcome="progress",
+    confidence=0.5,
+    status="exploring",
+)
+
+_BASE_SCRIPT_SECTION = ScriptSection(
+    proposition_id="P001",
+    priority="high",
+    instruction="EXPLORE",
+    main_question="How is teamwork?",
+    probes=["Example"],
+    context="",
+)
+
+
+def make_proposition(**overrides: Any) -> Proposition:
+    # Deep copy: the pipeline appends to the evidence lists in place.
+    return _BASE_PROPOSITION.model_copy(update=overrides, deep=True)
+
+
+def make_script_section(**overrides: Any) -> ScriptSection:
+    return _BASE_SCRIPT_SECTION.model_copy(update=overrides, deep=True)
+
+
+# Test data is known-good, so these skip pydantic validation; defaults still apply.
+def make_evidence(**fields: Any) -> Evidence:
+    return Evidence.model_construct(**fields)
+
+
+def make_interview(**fields: Any) -> Interview:
+    return Interview.model_construct(**fields)
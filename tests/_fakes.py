@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any
+
+from models.project import ProjectState, utc_now
+from services.project_service import ProjectAlreadyExistsError, ProjectNotFoundError
+
+
+class DummyLLM:
+    """Stand-in for LLMClient that answers every call with canned output."""
+
+    __slots__ = ("response", "fail", "json_response")
+
+    def __init__(
+        self,
+        response: str | None = None,
+        fail: bool = False,
+        json_response: dict[str, Any] | None = None,
+    ):
+        self.response = response
+        self.fail = fail
+        self.json_response = json_response or {}
+
+    async def chat(self, *args, **kwargs):
+        if self.fail:
+            raise RuntimeError("llm failure")
+        return self.response or ""
+
+    async def chat_json(self, *args, **kwargs):
+        if self.fail:
+            raise RuntimeError("llm failure")
+        return self.json_response
+
+
+class InMemoryProjectService:
+    """ProjectService double that keeps projects in a dict instead of JSON files.
+
+    Copies on save and load so callers see the same isolation as with the real service.
+    """
+
+    def __init__(self) -> None:
+        self._projects: dict[str, ProjectState] = {}
+
+    def exists(self, project_id: str) -> bool:
+        return project_id in self._projects
+
+    def create_project(
+        self,
+        project_id: str,
+        research_question: str,
+        initial_angles: list[str] | None = None,
+        language: str = "en",
+    ) -> ProjectState:
+        if self.exists(project_id):
+            raise ProjectAlreadyExistsError(f"Project '{project_id}' already exists")
+        project = ProjectState(
+            id=project_id,
+            research_question=research_question,
+            initial_angles=initial_angles or [],
+            language=language,
+            status="draft",
+        )
+        self.save_project(project)
+        return project
+
+    def load_project(self, project_id: str) -> ProjectState:
+        if project_id not in self._projects:
+            raise ProjectNotFoundError(f"Project '{project_id}' not found")
+        return self._projects[project_id].model_copy(deep=True)
+
+    def save_project(self, project: ProjectState) -> None:
+        project.updated_at = utc_now()
+        self._projects[project.id] = project.model_copy(deep=True)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    try:
+        import uvloop
+    except ImportError:  # uvloop is not available on Windows
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
@@ -2,17 +2,10 @@ from __future__ import annotations
 
 import pytest
 
+from _fakes import DummyLLM
 from agents.analyst import AnalystAgent
 
 
-class FakeLLM:
-    def __init__(self, payload):
-        self.payload = payload
-
-    async def chat_json(self, *args, **kwargs):
-        return self.payload
-
-
 @pytest.mark.asyncio
 async def test_analyst_coerces_partially_invalid_payload() -> None:
     payload = {
@@ -52,7 +45,7 @@ async def test_analyst_coerces_partially_invalid_payload() -> None:
         "metrics": {"convergence_score": 0.5, "novelty_rate": 0.2, "mode": "divergent"},
         "prunes": ["P999"],
     }
-    analyst = AnalystAgent(FakeLLM(payload))
+    analyst = AnalystAgent(DummyLLM(json_response=payload))
 
     result = await analyst.analyze_interview(
         transcript="User: It was intense",
@@ -90,7 +83,7 @@ async def test_analyst_marks_non_english_translation_pending() -> None:
         ],
         "metrics": {"convergence_score": 0.2, "novelty_rate": 0.8, "mode": "divergent"},
     }
-    analyst = AnalystAgent(FakeLLM(payload))
+    analyst = AnalystAgent(DummyLLM(json_response=payload))
 
     result = await analyst.analyze_interview(
         transcript="User: Я почти не спал",
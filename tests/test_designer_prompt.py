@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from _builders import make_script_section
+from agents.designer import DesignerAgent
+from models.script import InterviewScript
+
+
+def _script(main_question: str) -> InterviewScript:
+    return InterviewScript(
+        version=3,
+        research_question="RQ",
+        opening_question="Open",
+        sections=[make_script_section(main_question=main_question)],
+        closing_question="Close",
+        wildcard="Anything else?",
+    )
+
+
+def test_build_interviewer_prompt_reuses_render_for_same_script() -> None:
+    designer = DesignerAgent(llm=None)
+
+    first = designer.build_interviewer_prompt(_script("How is teamwork?"))
+    second = designer.build_interviewer_prompt(_script("How is teamwork?"))
+
+    assert first == second
+    assert "How is teamwork?" in first
+    assert len(designer._rendered_interviewer_prompts) == 1
+
+
+def test_build_interviewer_prompt_rerenders_when_content_changes() -> None:
+    designer = DesignerAgent(llm=None)
+
+    first = designer.build_interviewer_prompt(_script("How is teamwork?"))
+    edited = designer.build_interviewer_prompt(_script("What slowed you down?"))
+
+    assert "What slowed you down?" in edited
+    assert edited != first
@@ -214,9 +214,7 @@ async def test_pipeline_idempotency_and_updates(tmp_path):
     assert saved.proposition_store[0].confidence == 0.8
     assert saved.script_versions[-1].version == 2
 
-    events = []
-    while not queue.empty():
-        events.append(await queue.get())
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
     event_names = [item["event"] for item in events]
     assert "new_evidence" in event_names
     assert "proposition_updated" in event_names
@@ -291,9 +289,7 @@ async def test_pipeline_sanitizes_personalized_prompt_before_sync(tmp_path):
     assert saved.prompt_safety_status in {"sanitized", "fallback"}
     assert saved.prompt_safety_violations_count > 0
 
-    events = []
-    while not queue.empty():
-        events.append(await queue.get())
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
     names = [item["event"] for item in events]
     assert "prompt_sanitized" in names
 
@@ -363,8 +359,6 @@ async def test_pipeline_adds_heuristic_links_without_touching_confirmed(tmp_path
     assert prop.supporting_evidence == []
     assert len(prop.heuristic_supporting_evidence) >= 1
 
-    events = []
-    while not queue.empty():
-        events.append(await queue.get())
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
     names = [item["event"] for item in events]
     assert "heuristic_links_updated" in names
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 from fastapi import HTTPException
 
+from _builders import make_proposition, make_script_section
 from api.routes_projects import (
     StartProjectRequest,
     _generate_report_task,
@@ -12,8 +13,7 @@ from api.routes_projects import (
 )
 from models.analysis import AnalysisMetrics, AnalysisResult
 from models.evidence import Evidence
-from models.proposition import Proposition
-from models.script import InterviewScript, ScriptSection
+from models.script import InterviewScript
 from services.pipeline import Pipeline
 from services.project_service import ProjectService
 from services.script_safety import ScriptSafetyGuard
@@ -90,29 +90,17 @@ class SimpleDesigner:
 
     async def generate_initial_script(self, *args, **kwargs):
         propositions = [
-            Proposition(
-                id="P001",
-                factor="team dynamics",
+            make_proposition(
                 mechanism="alignment quality",
                 outcome="delivery pace",
                 confidence=0.2,
-                status="exploring",
             )
         ]
         script = InterviewScript(
             version=1,
             research_question=kwargs["research_question"],
             opening_question="Open",
-            sections=[
-                ScriptSection(
-                    proposition_id="P001",
-                    priority="high",
-                    instruction="EXPLORE",
-                    main_question="How is your team collaboration?",
-                    probes=["Example"],
-                    context="",
-                )
-            ],
+            sections=[make_script_section(main_question="How is your team collaboration?")],
             closing_question="Close",
             wildcard="Anything else?",
             mode="divergent",
@@ -123,6 +111,13 @@ class SimpleDesigner:
         return propositions, script
 
 
+# The doubles are stateless, so one instance of each serves every test.
+FAKE_SYNTHESIZER = FakeSynthesizer()
+NOOP_ELEVENLABS = NoopElevenLabs()
+SIMPLE_ANALYST = SimpleAnalyst()
+SIMPLE_DESIGNER = SimpleDesigner()
+
+
 @pytest.mark.asyncio
 async def test_generate_report_task_sets_done_and_report_fields(tmp_path):
     project_service = ProjectService(tmp_path)
@@ -133,7 +128,7 @@ async def test_generate_report_task_sets_done_and_report_fields(tmp_path):
     sse = SSEManager()
     queue = sse.subscribe("demo")
 
-    await _generate_report_task("demo", project_service, FakeSynthesizer(), sse)
+    await _generate_report_task("demo", project_service, FAKE_SYNTHESIZER, sse)
 
     saved = project_service.load_project("demo")
     assert saved.status == "done"
@@ -144,9 +139,7 @@ async def test_generate_report_task_sets_done_and_report_fields(tmp_path):
     assert saved.report_generation_mode == "llm"
     assert saved.report_fallback_reason is None
 
-    events = []
-    while not queue.empty():
-        events.append(await queue.get())
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
     names = [e["event"] for e in events]
     assert "report_ready" in names
     assert "project_status" in names
@@ -161,7 +154,7 @@ def test_qrcode_endpoint_returns_png(tmp_path):
     response = get_qrcode(
         "demo",
         project_service=project_service,
-        elevenlabs=NoopElevenLabs(),
+        elevenlabs=NOOP_ELEVENLABS,
     )
 
     assert response.media_type == "image/png"
@@ -176,31 +169,13 @@ async def test_pipeline_marks_report_stale_after_done(tmp_path):
     project.status = "done"
     project.report_stale = False
     project.elevenlabs_agent_id = "agent"
-    project.proposition_store = [
-        Proposition(
-            id="P001",
-            factor="team dynamics",
-            mechanism="alignment",
-            outcome="progress",
-            confidence=0.6,
-            status="confirmed",
-        )
-    ]
+    project.proposition_store = [make_proposition(confidence=0.6, status="confirmed")]
     project.script_versions = [
         InterviewScript(
             version=1,
             research_question=project.research_question,
             opening_question="Open",
-            sections=[
-                ScriptSection(
-                    proposition_id="P001",
-                    priority="high",
-                    instruction="EXPLORE",
-                    main_question="How is teamwork?",
-                    probes=["Example"],
-                    context="",
-                )
-            ],
+            sections=[make_script_section()],
             closing_question="Close",
             wildcard="Any more?",
             mode="convergent",
@@ -216,9 +191,9 @@ async def test_pipeline_marks_report_stale_after_done(tmp_path):
 
     pipeline = Pipeline(
         project_service=project_service,
-        analyst=SimpleAnalyst(),
-        designer=SimpleDesigner(),
-        elevenlabs=NoopElevenLabs(),
+        analyst=SIMPLE_ANALYST,
+        designer=SIMPLE_DESIGNER,
+        elevenlabs=NOOP_ELEVENLABS,
         sse=sse,
     )
 
@@ -233,9 +208,7 @@ async def test_pipeline_marks_report_stale_after_done(tmp_path):
     assert saved.report_stale is True
     assert saved.status == "done"
 
-    events = []
-    while not queue.empty():
-        events.append(await queue.get())
+    events = [queue.get_nowait() for _ in range(queue.qsize())]
     names = [e["event"] for e in events]
     assert "report_stale" in names
     assert "project_stats" in names
@@ -257,8 +230,8 @@ async def test_start_project_rejects_agent_used_by_active_project(tmp_path):
             project_id="target",
             payload=StartProjectRequest(elevenlabs_agent_id="agent_busy"),
             project_service=project_service,
-            designer=SimpleDesigner(),
-            elevenlabs=NoopElevenLabs(),
+            designer=SIMPLE_DESIGNER,
+            elevenlabs=NOOP_ELEVENLABS,
             script_safety=ScriptSafetyGuard(),
             settings=type("Settings", (), {"max_propositions_in_script": 8, "elevenlabs_agent_id": ""})(),
             sse=SSEManager(),
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from services.project_service import ProjectService
+
+
+def test_save_appends_delta_and_load_replays_wal(tmp_path) -> None:
+    service = ProjectService(tmp_path)
+    project = service.create_project("demo", "RQ")
+    project.status = "running"
+    service.save_project(project)
+
+    wal_lines = (tmp_path / "demo" / "project.wal").read_text(encoding="utf-8").splitlines()
+    assert len(wal_lines) == 1
+    assert set(json.loads(wal_lines[0])) == {"status", "updated_at"}
+
+    snapshot = json.loads((tmp_path / "demo" / "project.json").read_text(encoding="utf-8"))
+    assert snapshot["status"] == "draft"
+
+    reloaded = ProjectService(tmp_path).load_project("demo")
+    assert reloaded.status == "running"
+
+
+def test_wal_is_compacted_at_threshold_and_on_close(tmp_path) -> None:
+    service = ProjectService(tmp_path, wal_compact_every=3)
+    project = service.create_project("demo", "RQ")
+    wal_file = tmp_path / "demo" / "project.wal"
+
+    for agent in ("a1", "a2", "a3"):
+        project.elevenlabs_agent_id = agent
+        service.save_project(project)
+    assert not wal_file.exists()
+
+    project.status = "done"
+    service.save_project(project)
+    assert wal_file.exists()
+
+    service.close()
+    assert not wal_file.exists()
+    snapshot = json.loads((tmp_path / "demo" / "project.json").read_text(encoding="utf-8"))
+    assert snapshot["status"] == "done"
+    assert snapshot["elevenlabs_agent_id"] == "a3"
+
+
+def test_load_ignores_torn_trailing_wal_line(tmp_path) -> None:
+    service = ProjectService(tmp_path)
+    project = service.create_project("demo", "RQ")
+    project.status = "running"
+    service.save_project(project)
+
+    with (tmp_path / "demo" / "project.wal").open("a", encoding="utf-8") as f:
+        f.write('{"status": "do')
+
+    assert ProjectService(tmp_path).load_project("demo").status == "running"
+
+
+def test_save_logs_full_payload_after_external_snapshot_edit(tmp_path) -> None:
+    service = ProjectService(tmp_path)
+    project = service.create_project("demo", "RQ")
+
+    project_path = tmp_path / "demo" / "project.json"
+    data = json.loads(project_path.read_text(encoding="utf-8"))
+    data["research_question"] = "Edited outside"
+    project_path.write_text(json.dumps(data), encoding="utf-8")
+
+    service.save_project(project)
+
+    assert service.load_project("demo").research_question == "RQ"
+
+
+def test_saves_after_torn_wal_line_are_replayed_and_compacted(tmp_path) -> None:
+    service = ProjectService(tmp_path)
+    project = service.create_project("demo", "RQ")
+    project.elevenlabs_agent_id = "v1"
+    service.save_project(project)
+
+    with (tmp_path / "demo" / "project.wal").open("a", encoding="utf-8") as f:
+        f.write('{"status": "do')
+
+    service = ProjectService(tmp_path)
+    for agent in ("v2", "v3"):
+        project.elevenlabs_agent_id = agent
+        service.save_project(project)
+
+    assert ProjectService(tmp_path).load_project("demo").elevenlabs_agent_id == "v3"
+    service.close()
+    assert ProjectService(tmp_path).load_project("demo").elevenlabs_agent_id == "v3"
+
+
+def test_concurrent_saves_keep_delta_baseline_consistent(tmp_path, monkeypatch) -> None:
+    service = ProjectService(tmp_path)
+    project = service.create_project("demo", "RQ")
+    first = project.model_copy(deep=True)
+    first.elevenlabs_agent_id = "first"
+    second = project.model_copy(deep=True)
+    second.status = "running"
+
+    # Hold the first append open until the second save has been issued, so unguarded
+    # saves would interleave their compare/append/remember steps.
+    first_appending = threading.Event()
+    append_wal = service._append_wal
+
+    def slow_append(project_id, delta):
+        if not first_appending.is_set():
+            first_appending.set()
+            time.sleep(0.2)
+        append_wal(project_id, delta)
+
+    monkeypatch.setattr(service, "_append_wal", slow_append)
+    saver = threading.Thread(target=service.save_project, args=(first,))
+    saver.start()
+    first_appending.wait(timeout=5)
+    service.save_project(second)
+    saver.join()
+
+    project.elevenlabs_agent_id = "final"
+    service.save_project(project)
+
+    reloaded = ProjectService(tmp_path).load_project("demo")
+    assert reloaded.model_dump(mode="json") == project.model_dump(mode="json")
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from models.proposition import Proposition
+import pytest
+
+from _builders import make_proposition
 from models.script import InterviewScript, ScriptSection
 from services.script_safety import ScriptSafetyGuard
 
@@ -32,12 +34,45 @@ def _script_with_personal_memory() -> InterviewScript:
     )
 
 
-def test_script_safety_guard_detects_and_sanitizes() -> None:
+def _topic_drift_script() -> InterviewScript:
+    return InterviewScript(
+        version=1,
+        research_question="What shaped your onboarding experience in the first month?",
+        opening_question="How was your onboarding experience in the first month?",
+        sections=[
+            ScriptSection(
+                proposition_id="P001",
+                priority="high",
+                instruction="EXPLORE",
+                main_question="Tell me about your project implementation and tech stack decisions.",
+                probes=["What frameworks did you choose for your codebase?"],
+                context="Technical implementation details",
+            )
+        ],
+        closing_question="Anything else?",
+        wildcard="Any final notes?",
+        mode="divergent",
+        convergence_score=0.0,
+        novelty_rate=1.0,
+        changes_summary="Init",
+    )
+
+
+@pytest.fixture(scope="module")
+def personal_memory_script_en() -> InterviewScript:
+    return _script_with_personal_memory()
+
+
+@pytest.fixture(scope="module")
+def topic_drift_script_en() -> InterviewScript:
+    return _topic_drift_script()
+
+
+def test_script_safety_guard_detects_and_sanitizes(personal_memory_script_en) -> None:
     guard = ScriptSafetyGuard()
-    script = _script_with_personal_memory()
+    script = personal_memory_script_en.model_copy(deep=True)
     propositions = [
-        Proposition(
-            id="P001",
+        make_proposition(
             factor="Team formation dynamics",
             mechanism="Rule constraints",
             outcome="Collaboration quality",
@@ -59,32 +94,11 @@ def test_script_safety_guard_detects_and_sanitizes() -> None:
     assert "you said" not in result.script.sections[0].probes[0].lower()
 
 
-def test_script_safety_guard_triggers_topic_redirect() -> None:
+def test_script_safety_guard_triggers_topic_redirect(topic_drift_script_en) -> None:
     guard = ScriptSafetyGuard()
-    script = InterviewScript(
-        version=1,
-        research_question="What shaped your onboarding experience in the first month?",
-        opening_question="How was your onboarding experience in the first month?",
-        sections=[
-            ScriptSection(
-                proposition_id="P001",
-                priority="high",
-                instruction="EXPLORE",
-                main_question="Tell me about your project implementation and tech stack decisions.",
-                probes=["What frameworks did you choose for your codebase?"],
-                context="Technical implementation details",
-            )
-        ],
-        closing_question="Anything else?",
-        wildcard="Any final notes?",
-        mode="divergent",
-        convergence_score=0.0,
-        novelty_rate=1.0,
-        changes_summary="Init",
-    )
+    script = topic_drift_script_en.model_copy(deep=True)
     propositions = [
-        Proposition(
-            id="P001",
+        make_proposition(
             factor="Project constraints",
             mechanism="Time pressure",
             outcome="Delivery quality",
@@ -130,12 +144,45 @@ def _script_with_russian_personal_memory() -> InterviewScript:
     )
 
 
-def test_script_safety_guard_detects_russian_personal_refs() -> None:
+def _russian_topic_drift_script() -> InterviewScript:
+    return InterviewScript(
+        version=1,
+        research_question="Какие факторы влияют на ваш опыт адаптации?",
+        opening_question="Расскажите о вашем опыте адаптации.",
+        sections=[
+            ScriptSection(
+                proposition_id="P001",
+                priority="high",
+                instruction="EXPLORE",
+                main_question="Расскажите о вашем проекте и стеке технологий.",
+                probes=["Какую кодовую базу вы использовали?"],
+                context="Техническая реализация",
+            )
+        ],
+        closing_question="Что ещё?",
+        wildcard="Дополнительные заметки?",
+        mode="divergent",
+        convergence_score=0.0,
+        novelty_rate=1.0,
+        changes_summary="Init",
+    )
+
+
+@pytest.fixture(scope="module")
+def personal_memory_script_ru() -> InterviewScript:
+    return _script_with_russian_personal_memory()
+
+
+@pytest.fixture(scope="module")
+def topic_drift_script_ru() -> InterviewScript:
+    return _russian_topic_drift_script()
+
+
+def test_script_safety_guard_detects_russian_personal_refs(personal_memory_script_ru) -> None:
     guard = ScriptSafetyGuard()
-    script = _script_with_russian_personal_memory()
+    script = personal_memory_script_ru.model_copy(deep=True)
     propositions = [
-        Proposition(
-            id="P001",
+        make_proposition(
             factor="Динамика формирования команды",
             mechanism="Ограничения правил",
             outcome="Качество сотрудничества",
@@ -156,32 +203,11 @@ def test_script_safety_guard_detects_russian_personal_refs() -> None:
     assert "вы упоминали" not in result.script.opening_question.lower()
 
 
-def test_script_safety_guard_russian_topic_redirect() -> None:
+def test_script_safety_guard_russian_topic_redirect(topic_drift_script_ru) -> None:
     guard = ScriptSafetyGuard()
-    script = InterviewScript(
-        version=1,
-        research_question="Какие факторы влияют на ваш опыт адаптации?",
-        opening_question="Расскажите о вашем опыте адаптации.",
-        sections=[
-            ScriptSection(
-                proposition_id="P001",
-                priority="high",
-                instruction="EXPLORE",
-                main_question="Расскажите о вашем проекте и стеке технологий.",
-                probes=["Какую кодовую базу вы использовали?"],
-                context="Техническая реализация",
-            )
-        ],
-        closing_question="Что ещё?",
-        wildcard="Дополнительные заметки?",
-        mode="divergent",
-        convergence_score=0.0,
-        novelty_rate=1.0,
-        changes_summary="Init",
-    )
+    script = topic_drift_script_ru.model_copy(deep=True)
     propositions = [
-        Proposition(
-            id="P001",
+        make_proposition(
             factor="Ограничения проекта",
             mechanism="Давление сроков",
             outcome="Качество результата",
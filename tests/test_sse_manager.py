@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+
+from services.sse_manager import SSEManager
+
+
+async def test_sse_manager_delivers_events_in_order() -> None:
+    sse = SSEManager()
+    queue = sse.subscribe("demo")
+
+    await sse.emit("demo", "first", {"n": 1})
+    await sse.emit("demo", "second", {"n": 2})
+
+    assert (await queue.get())["event"] == "first"
+    assert (await queue.get())["event"] == "second"
+    assert queue.empty()
+
+
+async def test_sse_manager_get_waits_for_next_event() -> None:
+    sse = SSEManager()
+    queue = sse.subscribe("demo")
+
+    waiter = asyncio.ensure_future(queue.get())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await sse.emit("demo", "late", {})
+    message = await asyncio.wait_for(waiter, timeout=1)
+    assert message["event"] == "late"
+
+
+async def test_sse_manager_drops_oldest_under_pressure() -> None:
+    sse = SSEManager()
+    queue = sse.subscribe("demo", maxsize=10)
+
+    for i in range(300):
+        await sse.emit("demo", "tick", {"i": i})
+
+    assert queue.qsize() == 10
+    assert queue.get_nowait()["data"]["i"] == 290
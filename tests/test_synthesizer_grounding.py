@@ -1,51 +1,86 @@
 from __future__ import annotations
 
+from typing import Final
+
 import pytest
 
+from _builders import make_evidence, make_interview, make_proposition
+from _fakes import DummyLLM
 from agents.synthesizer import SynthesizerAgent
 from models.evidence import Evidence
 from models.interview import Interview
 from models.project import ProjectState
 from models.proposition import Proposition
 
+# The scenarios never block (DummyLLM returns immediately), so one event loop for the
+# whole module replaces per-test loop setup and teardown.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+HALLUCINATED_REPORT: Final = '## Executive Summary\n\n"Participant A said she skipped meals"'
+GROUNDED_REPORT: Final = '## Executive Summary\n\n"I only slept two hours"'
+TRANSLATED_REPORT: Final = (
+    "## Core Findings\n\n"
+    'The participant described exhaustion: "I barely slept." '
+    '[original: "Я почти не спал"]'
+)
+TRANSLATED_VARIANT_REPORT: Final = (
+    "## Core Findings\n\n"
+    'The participant described exhaustion: "I barely slept." '
+    '[original: "Я почти не спал вообще почти ни минуты"]'
+)
+UNTRANSLATED_QUOTE_REPORT: Final = '## Core Findings\n\n"Я почти не спал"'
+
+
+@pytest.fixture(scope="module")
+def base_project() -> ProjectState:
+    return ProjectState(id="demo", research_question="RQ", status="running")
+
+
+@pytest.fixture(scope="module")
+def base_interview() -> Interview:
+    return make_interview(
+        id="INT_001",
+        conversation_id="conv-1",
+        transcript="text",
+        language="en",
+        metadata={},
+    )
+
+
+@pytest.fixture(scope="module")
+def base_evidence() -> Evidence:
+    return make_evidence(
+        id="E001",
+        interview_id="INT_001",
+        quote="I only slept two hours",
+        interpretation="Fatigue impacted performance",
+        factor="time pressure",
+        mechanism="sleep deprivation",
+        outcome="lower focus",
+        tags=["fatigue"],
+        language="en",
+    )
+
+
+@pytest.fixture
+def fresh_project(base_project) -> ProjectState:
+    return base_project.model_copy(
+        update={"interview_store": [], "evidence_store": [], "proposition_store": []}
+    )
+
 
-class DummyLLM:
-    def __init__(
-        self,
-        response: str | None = None,
-        fail: bool = False,
-        json_response: dict | None = None,
-    ):
-        self.response = response
-        self.fail = fail
-        self.json_response = json_response or {}
-
-    async def chat(self, *args, **kwargs):
-        if self.fail:
-            raise RuntimeError("llm failure")
-        return self.response or ""
-
-    async def chat_json(self, *args, **kwargs):
-        if self.fail:
-            raise RuntimeError("llm failure")
-        return self.json_response
-
-
-def _sample_project() -> ProjectState:
-    project = ProjectState(
-        id="demo",
-        research_question="RQ",
-        status="running",
+def _sleep_proposition(**overrides) -> Proposition:
+    return make_proposition(
+        factor="time pressure",
+        mechanism="sleep deprivation",
+        outcome="lower focus",
+        supporting_evidence=["E001"],
+        **overrides,
     )
-    project.interview_store = []
-    project.evidence_store = []
-    project.proposition_store = []
-    return project
 
 
-@pytest.mark.asyncio
-async def test_synthesizer_no_data_report_when_empty():
-    project = _sample_project()
+async def test_synthesizer_no_data_report_when_empty(fresh_project):
+    project = fresh_project
     agent = SynthesizerAgent(DummyLLM(response="ignored"))
 
     report = await agent.synthesize(project)
@@ -54,45 +89,13 @@ async def test_synthesizer_no_data_report_when_empty():
     assert "No interview evidence is currently stored" in report
 
 
-@pytest.mark.asyncio
-async def test_synthesizer_rejects_hallucinated_quotes_and_falls_back():
-    project = _sample_project()
-    project.interview_store = [
-        Interview(
-            id="INT_001",
-            conversation_id="conv-1",
-            transcript="text",
-            language="en",
-            metadata={},
-        )
-    ]
-    project.evidence_store = [
-        Evidence(
-            id="E001",
-            interview_id="INT_001",
-            quote="I only slept two hours",
-            interpretation="Fatigue impacted performance",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            tags=["fatigue"],
-            language="en",
-        )
-    ]
-    project.proposition_store = [
-        Proposition(
-            id="P001",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            confidence=0.9,
-            status="confirmed",
-            supporting_evidence=["E001"],
-        )
-    ]
+async def test_synthesizer_rejects_hallucinated_quotes_and_falls_back(fresh_project, base_interview, base_evidence):
+    project = fresh_project
+    project.interview_store = [base_interview]
+    project.evidence_store = [base_evidence]
+    project.proposition_store = [_sleep_proposition(confidence=0.9, status="confirmed")]
 
-    hallucinated = '## Executive Summary\n\n"Participant A said she skipped meals"'
-    agent = SynthesizerAgent(DummyLLM(response=hallucinated))
+    agent = SynthesizerAgent(DummyLLM(response=HALLUCINATED_REPORT))
 
     report = await agent.synthesize(project)
 
@@ -101,167 +104,67 @@ async def test_synthesizer_rejects_hallucinated_quotes_and_falls_back():
     assert "I only slept two hours" in report
 
 
-@pytest.mark.asyncio
-async def test_synthesizer_uses_llm_when_grounded():
-    project = _sample_project()
-    project.interview_store = [
-        Interview(
-            id="INT_001",
-            conversation_id="conv-1",
-            transcript="text",
-            language="en",
-            metadata={},
-        )
-    ]
-    project.evidence_store = [
-        Evidence(
-            id="E001",
-            interview_id="INT_001",
-            quote="I only slept two hours",
-            interpretation="Fatigue impacted performance",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            tags=["fatigue"],
-            language="en",
-        )
-    ]
+async def test_synthesizer_uses_llm_when_grounded(fresh_project, base_interview, base_evidence):
+    project = fresh_project
+    project.interview_store = [base_interview]
+    project.evidence_store = [base_evidence]
 
-    grounded = '## Executive Summary\n\n"I only slept two hours"'
-    agent = SynthesizerAgent(DummyLLM(response=grounded))
+    agent = SynthesizerAgent(DummyLLM(response=GROUNDED_REPORT))
 
     report = await agent.synthesize(project)
 
-    assert report == grounded
+    assert report == GROUNDED_REPORT
 
 
-@pytest.mark.asyncio
-async def test_synthesizer_accepts_translated_quotes_with_original_marker():
-    project = _sample_project()
-    project.interview_store = [
-        Interview(
-            id="INT_001",
-            conversation_id="conv-1",
-            transcript="text",
-            language="ru",
-            metadata={},
-        )
-    ]
+async def test_synthesizer_accepts_translated_quotes_with_original_marker(fresh_project, base_interview, base_evidence):
+    project = fresh_project
+    project.interview_store = [base_interview.model_copy(update={"language": "ru"})]
     project.evidence_store = [
-        Evidence(
-            id="E001",
-            interview_id="INT_001",
-            quote="Я почти не спал",
-            interpretation="Fatigue impacted performance",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            tags=["fatigue"],
-            language="ru",
-        )
+        base_evidence.model_copy(update={"quote": "Я почти не спал", "language": "ru"})
     ]
 
-    translated_report = (
-        "## Core Findings\n\n"
-        'The participant described exhaustion: "I barely slept." '
-        '[original: "Я почти не спал"]'
-    )
     agent = SynthesizerAgent(
         DummyLLM(
-            response=translated_report,
+            response=TRANSLATED_REPORT,
             json_response={"translations": [{"id": "E001", "english": "I barely slept."}]},
         )
     )
 
     report = await agent.synthesize(project)
 
-    assert report == translated_report
+    assert report == TRANSLATED_REPORT
 
 
-@pytest.mark.asyncio
-async def test_synthesizer_accepts_minor_original_quote_variation():
-    project = _sample_project()
-    project.interview_store = [
-        Interview(
-            id="INT_001",
-            conversation_id="conv-1",
-            transcript="text",
-            language="ru",
-            metadata={},
-        )
-    ]
+async def test_synthesizer_accepts_minor_original_quote_variation(fresh_project, base_interview, base_evidence):
+    project = fresh_project
+    project.interview_store = [base_interview.model_copy(update={"language": "ru"})]
     project.evidence_store = [
-        Evidence(
-            id="E001",
-            interview_id="INT_001",
-            quote="Я почти не спал, вообще почти ни минуты",
-            interpretation="Fatigue impacted performance",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            tags=["fatigue"],
-            language="ru",
-        )
+        base_evidence.model_copy(update={"quote": "Я почти не спал, вообще почти ни минуты", "language": "ru"})
     ]
 
-    translated_report = (
-        "## Core Findings\n\n"
-        'The participant described exhaustion: "I barely slept." '
-        '[original: "Я почти не спал вообще почти ни минуты"]'
-    )
     agent = SynthesizerAgent(
         DummyLLM(
-            response=translated_report,
+            response=TRANSLATED_VARIANT_REPORT,
             json_response={"translations": [{"id": "E001", "english": "I barely slept."}]},
         )
     )
 
     report = await agent.synthesize(project)
 
-    assert report == translated_report
+    assert report == TRANSLATED_VARIANT_REPORT
 
 
-@pytest.mark.asyncio
-async def test_synthesizer_rejects_non_english_quotes_outside_original_marker():
-    project = _sample_project()
-    project.interview_store = [
-        Interview(
-            id="INT_001",
-            conversation_id="conv-1",
-            transcript="text",
-            language="ru",
-            metadata={},
-        )
-    ]
+async def test_synthesizer_rejects_non_english_quotes_outside_original_marker(fresh_project, base_interview, base_evidence):
+    project = fresh_project
+    project.interview_store = [base_interview.model_copy(update={"language": "ru"})]
     project.evidence_store = [
-        Evidence(
-            id="E001",
-            interview_id="INT_001",
-            quote="Я почти не спал",
-            interpretation="Fatigue impacted performance",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            tags=["fatigue"],
-            language="ru",
-        )
-    ]
-    project.proposition_store = [
-        Proposition(
-            id="P001",
-            factor="time pressure",
-            mechanism="sleep deprivation",
-            outcome="lower focus",
-            confidence=0.6,
-            status="exploring",
-            supporting_evidence=["E001"],
-        )
+        base_evidence.model_copy(update={"quote": "Я почти не спал", "language": "ru"})
     ]
+    project.proposition_store = [_sleep_proposition(confidence=0.6, status="exploring")]
 
-    llm_output = '## Core Findings\n\n"Я почти не спал"'
     agent = SynthesizerAgent(
         DummyLLM(
-            response=llm_output,
+            response=UNTRANSLATED_QUOTE_REPORT,
             json_response={"translations": [{"id": "E001", "english": "I barely slept."}]},
         )
     )
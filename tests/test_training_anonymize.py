@@ -1,6 +1,21 @@
 from __future__ import annotations
 
-from training.anonymize import detect_leaks, regex_cleanup_example
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from training import anonymize
+from training.anonymize import (
+    _iter_output_keys,
+    _record_key,
+    anonymize_batch_with_llm,
+    anonymize_with_llm,
+    detect_leaks,
+    regex_cleanup_example,
+    regex_cleanup_with_leaks,
+)
 
 
 def test_regex_cleanup_removes_contacts_and_yandex() -> None:
@@ -16,6 +31,20 @@ def test_regex_cleanup_removes_contacts_and_yandex() -> None:
     assert "[URL]" in cleaned["improved_question"]
 
 
+def test_regex_cleanup_redacts_whole_url_token() -> None:
+    long_url = "https://example.com/" + "a" * 3000 + "/secret"
+    sample = {
+        "context": [{"role": "user", "content": "See https://example.com/a'b/secret\"x now"}],
+        "good_question": f"Open {long_url} please?",
+        "improved_question": "What happened next?",
+        "technique": "why",
+    }
+    cleaned = regex_cleanup_example(sample)
+    assert cleaned["context"][0]["content"] == "See [URL] now"
+    assert cleaned["good_question"] == "Open [URL] please?"
+    assert detect_leaks(cleaned) == []
+
+
 def test_detect_leaks_flags_remaining_pii() -> None:
     sample = {
         "context": [{"role": "user", "content": "Reach me at john@corp.com"}],
@@ -24,3 +53,122 @@ def test_detect_leaks_flags_remaining_pii() -> None:
     }
     leaks = detect_leaks(sample)
     assert "email" in leaks
+
+
+def test_regex_cleanup_with_leaks_matches_separate_detect_pass() -> None:
+    sample = {
+        "context": [{"role": "User", "content": "Write to me@example.com or @handle_1"}],
+        "good_question": "Why did you leave?",
+        "improved_question": "What did ticket 12345678 change?",
+        "technique": "why",
+    }
+    cleaned, leaks = regex_cleanup_with_leaks(sample)
+    assert cleaned == regex_cleanup_example(sample)
+    assert leaks == detect_leaks(cleaned) == []
+    assert cleaned["context"][0] == {"role": "user", "content": "Write to [CONTACT] or [CONTACT]"}
+
+
+class FakeClient:
+    def __init__(self, payload: dict[str, object]) -> None:
+        self.payload = payload
+
+    def chat_json(self, **_: object) -> dict[str, object]:
+        return self.payload
+
+
+def test_anonymize_batch_with_llm_keeps_input_order() -> None:
+    example = {
+        "context": [{"role": "user", "content": "I worked at [ORG]"}],
+        "good_question": "What changed?",
+        "quality_score": 4,
+    }
+    client = FakeClient(
+        {"results": [{"keep": False, "drop_reason": "too_specific"}, {"keep": True, "example": example}]}
+    )
+    results = anonymize_batch_with_llm(client=client, model="m", records=[{}, {}, {}])
+    assert results[0] == (None, "too_specific")
+    assert results[1][0] is not None and results[1][0]["improved_question"] == "What changed?"
+    assert results[2] == (None, "missing_batch_result")
+
+
+def test_anonymize_with_llm_sends_static_prefix_then_record() -> None:
+    seen: list[str] = []
+
+    class RecordingClient:
+        def chat_json(self, *, messages: list[dict[str, str]], **_: object) -> dict[str, object]:
+            seen.append(messages[-1]["content"])
+            return {"keep": False, "drop_reason": "nope"}
+
+    record = {"good_question": "Что дальше?", "context": []}
+    assert anonymize_with_llm(client=RecordingClient(), model="m", record=record) == (None, "nope")
+    payload = json.loads(seen[0])
+    assert payload["task"] == "Sanitize one training example"
+    assert payload["input_example"] == record
+    assert list(payload)[-1] == "input_example"
+
+
+def test_iter_output_keys_matches_full_parse(tmp_path) -> None:
+    rows = [
+        {
+            "context": [{"role": "user", "content": 'He said "good_question": no'}],
+            "good_question": " What next? ",
+            "technique": "source_file",
+            "source_file": "/data/a.json",
+            "turn_index": 3,
+        },
+        {"context": [], "good_question": "Why?", "source_file": "/data/b.json"},
+    ]
+    path = tmp_path / "out.jsonl"
+    path.write_text(
+        json.dumps(rows[0], ensure_ascii=False) + "\n\n" + json.dumps(rows[1], separators=(",", ":")) + "\n",
+        encoding="utf-8",
+    )
+    assert list(_iter_output_keys(path)) == [_record_key(row) for row in rows]
+
+
+def test_failed_batch_keeps_skipped_records_skipped(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    done = {"source_file": "a.json", "turn_index": 1, "good_question": "Why?"}
+    new = {"source_file": "a.json", "turn_index": 3, "good_question": "How?"}
+    input_path = tmp_path / "in.jsonl"
+    input_path.write_text("".join(json.dumps(row) + "\n" for row in (done, new)), encoding="utf-8")
+    output_path = tmp_path / "out.jsonl"
+    output_path.write_text(json.dumps(done) + "\n", encoding="utf-8")
+    manifest_path = tmp_path / "manifest.jsonl"
+
+    class BrokenClient:
+        def __init__(self, *_: object, **__: object) -> None:
+            pass
+
+        def __enter__(self) -> BrokenClient:
+            return self
+
+        def __exit__(self, *_: object) -> None:
+            pass
+
+        def chat_json(self, **_: object) -> dict[str, object]:
+            raise RuntimeError("Failed to call Mistral API after retries")
+
+    monkeypatch.setenv("MISTRAL_API_KEY", "test")
+    monkeypatch.setattr(anonymize, "MistralClient", BrokenClient)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "anonymize",
+            "--input",
+            str(input_path),
+            "--output",
+            str(output_path),
+            "--manifest",
+            str(manifest_path),
+            "--report-out",
+            str(tmp_path / "report.json"),
+            "--resume",
+            "--batch-size",
+            "2",
+        ],
+    )
+
+    assert anonymize.main() == 1
+    statuses = [json.loads(line)["status"] for line in manifest_path.read_text(encoding="utf-8").splitlines()]
+    assert statuses == ["skipped_existing", "failed"]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from training.common import (
+    MistralClient,
+    collect_audio_files,
+    collect_transcript_files,
+    iter_audio_files,
+    json_from_text,
+    scan_tail_fields,
+    write_json,
+)
+
+
+def test_json_from_text_extracts_first_value_from_prose() -> None:
+    raw = 'Sure! Here it is:\n```json\n{"mapping": {"A": "MODERATOR"}}\n```\nLet me know {if} more.'
+    assert json_from_text(raw) == {"mapping": {"A": "MODERATOR"}}
+
+
+def test_json_from_text_skips_non_json_brackets() -> None:
+    assert json_from_text("[note] result: [1, 2]") == [1, 2]
+
+
+def test_json_from_text_prefers_objects_over_earlier_arrays() -> None:
+    assert json_from_text('Sure [1]: {"a": 1}') == {"a": 1}
+
+
+def test_scan_tail_fields_reads_real_keys_from_the_tail() -> None:
+    line = json.dumps(
+        {"context": [{"content": '"turn_index": 99, "source_file": "fake"'}], "source_file": "/a.json", "turn_index": 3}
+    )
+    assert scan_tail_fields(line, ("source_file", "turn_index")) == {"source_file": "/a.json", "turn_index": 3}
+    assert scan_tail_fields(line, ("good_question",)) is None
+
+
+def test_json_from_text_rejects_text_without_json() -> None:
+    with pytest.raises(ValueError):
+        json_from_text("no payload here {")
+
+
+def test_request_honors_retry_after_on_429() -> None:
+    calls: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+    # A long exponential backoff would make the test hang if Retry-After were ignored.
+    client = MistralClient(
+        "key",
+        "https://api.test",
+        backoff_seconds=30.0,
+        requests_per_minute=600,
+        transport=httpx.MockTransport(handler),
+    )
+    with client:
+        assert client.chat_json(model="m", messages=[]) == {"ok": True}
+    assert len(calls) == 2
+
+
+def test_chat_stream_joins_sse_deltas() -> None:
+    body = (
+        'data: {"choices": [{"index": 0, "delta": {"role": "assistant", "content": "{\\"ok\\""}}]}\n\n'
+        'data: {"choices": [{"index": 0, "delta": {"content": ": true}"}}]}\n\n'
+        "data: [DONE]\n\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert b'"stream":true' in request.content.replace(b" ", b"")
+        return httpx.Response(200, content=body.encode(), headers={"Content-Type": "text/event-stream"})
+
+    with MistralClient("key", "https://api.test", transport=httpx.MockTransport(handler)) as client:
+        assert client.chat_json(model="m", messages=[], stream=True) == {"ok": True}
+
+
+def test_collect_transcript_files_skips_raw_subtrees(tmp_path: Path) -> None:
+    for relative in ["b.json", "a/c.json", "a/raw/d.json", "raw/e.json", "a/notes.txt"]:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}", encoding="utf-8")
+    assert collect_transcript_files(tmp_path) == [tmp_path / "a" / "c.json", tmp_path / "b.json"]
+
+
+def test_write_json_replaces_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "nested" / "out.json"
+    write_json(path, {"a": 1})
+    write_json(path, {"a": 2})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 2}
+    assert [item.name for item in path.parent.iterdir()] == ["out.json"]
+
+
+def test_iter_audio_files_yields_sorted_paths_lazily(tmp_path: Path) -> None:
+    for relative in ["b.mp3", "a/z.WAV", "a/b/c.m4a", "a.mp3", "notes.txt", "ab/d.flac"]:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    expected = sorted(
+        path for path in tmp_path.rglob("*") if path.is_file() and path.suffix.lower() != ".txt"
+    )
+    assert collect_audio_files(tmp_path) == expected
+    assert next(iter_audio_files(tmp_path)) == expected[0]
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from training.extract_examples import _find_turn_index, _sanitize_example, _to_training_turns
+import json
+from pathlib import Path
+
+import pytest
+
+from training.extract_examples import (
+    _chat_json,
+    _extract_batch_with_model,
+    _extract_with_model,
+    _find_turn_index,
+    _iter_output_sources,
+    _sanitize_example,
+    _to_training_turns,
+)
 
 
 def test_to_training_turns_maps_roles() -> None:
@@ -34,3 +47,157 @@ def test_find_turn_index() -> None:
         {"role": "assistant", "content": "What happened next?"},
     ]
     assert _find_turn_index(turns, "What happened next?") == 1
+
+class FakeClient:
+    def __init__(self, response: str) -> None:
+        self.response = response
+
+    def chat(self, **_: object) -> str:
+        return self.response
+
+    def chat_stream(self, **kwargs: object) -> str:
+        return self.chat(**kwargs)
+
+
+def test_extract_batch_with_model_dispatches_by_id_and_falls_back_per_file() -> None:
+    transcript = {
+        "language": "en",
+        "segments": [
+            {"role": "INTERVIEWEE", "text": "It was chaotic"},
+            {"role": "MODERATOR", "text": "What made it chaotic?"},
+        ],
+    }
+    example = {
+        "context": [{"role": "user", "content": "It was chaotic"}],
+        "good_question": "What made it chaotic?",
+        "quality_score": 5,
+    }
+    requests: list[dict[str, object]] = []
+
+    class BatchClient:
+        def chat_stream(self, *, messages: list[dict[str, str]], **_: object) -> str:
+            payload = json.loads(messages[1]["content"])
+            requests.append(payload)
+            if "items" in payload:
+                # Item "0" is left out of the answer, so it is retried on its own.
+                return json.dumps({"examples_by_id": {"1": [example]}})
+            return json.dumps({"examples": [example, example]})
+
+    results = _extract_batch_with_model(
+        client=BatchClient(),  # type: ignore[arg-type]
+        model="m",
+        system_prompt="sys",
+        batch=[(Path("/data/a.json"), transcript), (Path("/data/b.json"), transcript)],
+        min_quality=4,
+        max_turns=50,
+    )
+    assert [item["id"] for item in requests[0]["items"]] == ["0", "1"]
+    assert requests[1]["source_file"] == "/data/a.json"
+    assert [manifest["examples"] for _, manifest in results] == [2, 1]
+    assert results[1][0][0]["source_file"] == "/data/b.json"
+    assert results[1][0][0]["turn_index"] == 1
+
+
+def test_iter_output_sources_reads_source_file(tmp_path: Path) -> None:
+    output = tmp_path / "examples.jsonl"
+    rows = [
+        {"context": [{"role": "user", "content": '"source_file": "fake"'}], "source_file": "/data/a.json"},
+        {"source_file": "/data/b.json", "turn_index": 3},
+    ]
+    output.write_text("".join(json.dumps(row) + "\n" for row in rows) + "\n", encoding="utf-8")
+    assert list(_iter_output_sources(output)) == ["/data/a.json", "/data/b.json"]
+
+
+def test_find_turn_index_prefers_first_exact_match_over_substring() -> None:
+    turns = [
+        {"role": "assistant", "content": "Why did the team split up?"},
+        {"role": "user", "content": "why"},
+        {"role": "assistant", "content": "Why?"},
+        {"role": "assistant", "content": " why? "},
+    ]
+    assert _find_turn_index(turns, "WHY?") == 2
+    assert _find_turn_index(turns, "the team split") == 0
+    assert _find_turn_index(turns, "unrelated") == -1
+
+
+class CountingClient(FakeClient):
+    def __init__(self, response: str) -> None:
+        super().__init__(response)
+        self.calls = 0
+
+    def chat(self, **kwargs: object) -> str:
+        self.calls += 1
+        return super().chat(**kwargs)
+
+
+def test_chat_json_reuses_cached_reply(tmp_path: Path) -> None:
+    client = CountingClient('{"examples": []}')
+    request = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.1, "max_tokens": 10}
+
+    assert _chat_json(client, cache_dir=tmp_path, **request) == {"examples": []}
+    assert _chat_json(client, cache_dir=tmp_path, **request) == {"examples": []}
+    assert client.calls == 1
+
+    _chat_json(client, cache_dir=tmp_path, **{**request, "model": "other"})
+    _chat_json(client, cache_dir=None, **request)
+    assert client.calls == 3
+
+
+def test_chat_json_does_not_cache_malformed_reply(tmp_path: Path) -> None:
+    client = CountingClient('{"examples": [{"question": "trunc')
+    request = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.1, "max_tokens": 10}
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            _chat_json(client, cache_dir=tmp_path, **request)
+    assert client.calls == 2
+    assert not list(tmp_path.rglob("*.json"))
+
+
+def test_to_training_turns_skips_unknown_and_empty_then_truncates() -> None:
+    segments = [
+        {"role": "moderator", "text": " First? "},
+        {"role": "NOTE", "text": "ignored"},
+        {"role": "INTERVIEWEE", "text": "   "},
+        {"role": "INTERVIEWEE", "text": "Answer"},
+        {"role": "MODERATOR", "text": "Second?"},
+    ]
+    assert _to_training_turns(segments, max_turns=2) == [
+        {"role": "assistant", "content": "First?"},
+        {"role": "user", "content": "Answer"},
+    ]
+    assert len(_to_training_turns(segments, max_turns=0)) == 3
+
+
+class RecordingClient(FakeClient):
+    def __init__(self, response: str) -> None:
+        super().__init__(response)
+        self.requests: list[dict[str, object]] = []
+
+    def chat(self, **kwargs: object) -> str:
+        self.requests.append(kwargs)
+        return super().chat(**kwargs)
+
+
+def test_extract_with_model_user_content_is_valid_json() -> None:
+    client = RecordingClient('{"examples": []}')
+    transcript = {"language": "ru", "segments": [{"role": "MODERATOR", "text": 'Say "why"?'}]}
+    _extract_with_model(
+        client=client,
+        model="m",
+        system_prompt="sys",
+        source_file=Path("/data/a.json"),
+        transcript=transcript,
+        min_quality=4,
+        max_turns=50,
+    )
+    messages = client.requests[0]["messages"]
+    assert json.loads(messages[1]["content"]) == {
+        "instructions": {
+            "output": {"examples": "array of extracted training examples"},
+            "min_quality_score": 4,
+        },
+        "language": "ru",
+        "conversation_turns": [{"role": "assistant", "content": 'Say "why"?'}],
+        "source_file": "/data/a.json",
+    }
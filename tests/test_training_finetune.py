@@ -1,33 +1,57 @@
 from __future__ import annotations
 
-from argparse import Namespace
-
-from training.finetune import _build_hyperparameters
-
-
-def test_build_hyperparameters_defaults() -> None:
-    args = Namespace(
-        training_steps=120,
-        learning_rate=0.0,
-        epochs=0.0,
-        seq_len=0,
-        fim_ratio=-1.0,
-    )
-    params = _build_hyperparameters(args)
-    assert params == {"training_steps": 120}
-
-
-def test_build_hyperparameters_with_overrides() -> None:
-    args = Namespace(
-        training_steps=100,
-        learning_rate=0.0002,
-        epochs=2.0,
-        seq_len=4096,
-        fim_ratio=0.5,
-    )
-    params = _build_hyperparameters(args)
-    assert params["training_steps"] == 100
-    assert params["learning_rate"] == 0.0002
-    assert params["epochs"] == 2.0
-    assert params["seq_len"] == 4096
-    assert params["fim_ratio"] == 0.5
+from types import SimpleNamespace
+
+import pytest
+
+from training.finetune import _build_hyperparameters, _next_poll_delay
+
+
+DEFAULTS = SimpleNamespace(
+    training_steps=120,
+    learning_rate=0.0,
+    epochs=0.0,
+    seq_len=0,
+    fim_ratio=-1.0,
+)
+
+OVERRIDES = SimpleNamespace(
+    training_steps=100,
+    learning_rate=0.0002,
+    epochs=2.0,
+    seq_len=4096,
+    fim_ratio=0.5,
+)
+
+
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        pytest.param(DEFAULTS, {"training_steps": 120}, id="defaults"),
+        pytest.param(
+            OVERRIDES,
+            {
+                "training_steps": 100,
+                "learning_rate": 0.0002,
+                "epochs": 2.0,
+                "seq_len": 4096,
+                "fim_ratio": 0.5,
+            },
+            id="with_overrides",
+        ),
+    ],
+)
+def test_build_hyperparameters(args, expected) -> None:
+    assert _build_hyperparameters(args) == expected
+
+
+@pytest.mark.parametrize(
+    ("delay", "status_changed", "expected"),
+    [
+        pytest.param(5, False, 10, id="doubles"),
+        pytest.param(20, False, 30, id="capped_at_interval"),
+        pytest.param(30, True, 5, id="resets_on_status_change"),
+    ],
+)
+def test_next_poll_delay(delay, status_changed, expected) -> None:
+    assert _next_poll_delay(delay, interval=30, status_changed=status_changed) == expected
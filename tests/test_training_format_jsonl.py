@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from training import format_jsonl
 from training.format_jsonl import _estimate_tokens, _normalize_record
 
 
@@ -23,3 +30,30 @@ def test_normalize_record_builds_messages() -> None:
     assert record["messages"][0]["role"] == "user"
     assert "Conversation context" in record["messages"][0]["content"]
     assert record["messages"][1]["content"] == "What part was hardest?"
+
+
+def test_main_keeps_previous_output_when_nothing_passes_filters(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    input_path = tmp_path / "in.jsonl"
+    input_path.write_text(json.dumps({"good_question": "Why?", "quality_score": 1}) + "\n", encoding="utf-8")
+    output_path = tmp_path / "out.jsonl"
+    output_path.write_text("previous dataset\n", encoding="utf-8")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "format_jsonl",
+            "--input",
+            str(input_path),
+            "--output",
+            str(output_path),
+            "--stats-out",
+            str(tmp_path / "stats.json"),
+        ],
+    )
+
+    with pytest.raises(SystemExit, match="No records passed formatting filters"):
+        format_jsonl.main()
+    assert output_path.read_text(encoding="utf-8") == "previous dataset\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["in.jsonl", "out.jsonl"]
@@ -1,23 +1,27 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 from training.normalize_speakers import (
     ROLE_INTERVIEWEE,
     ROLE_MODERATOR,
+    BatchMappingResults,
+    _analyze,
+    _llm_mapping_messages,
+    _llm_mapping_prompt_payload,
+    _map_rows,
+    _request_key,
+    apply_role_mapping,
     gate_two_roles,
     heuristic_mapping,
     normalize_transcript_entry,
     question_ratio,
+    run_mapping_batch,
+    run_mapping_packed,
 )
 
 
-class FakeClient:
-    def __init__(self, mapping: dict[str, str]) -> None:
-        self.mapping = mapping
-
-    def chat_json(self, **_: object) -> dict[str, object]:
-        return {"mapping": self.mapping}
-
-
 def _segments() -> list[dict[str, object]]:
     return [
         {"speaker_id": "A", "text": "Hello everyone?", "start": 0.0, "end": 1.0},
@@ -47,15 +51,147 @@ def test_gate_two_roles() -> None:
     assert reasons == []
 
 
+class FailingClient:
+    def chat_json(self, **_: object) -> dict[str, object]:
+        raise AssertionError("heuristic mapping passes the gate, the model must not be called")
+
+
 def test_normalize_transcript_entry_auto_merge_to_two_roles() -> None:
     transcript = {"language": "en", "segments": _segments()}
     normalized, manifest = normalize_transcript_entry(
         transcript=transcript,
-        client=FakeClient({"A": ROLE_MODERATOR, "B": ROLE_INTERVIEWEE, "C": ROLE_INTERVIEWEE}),
+        client=FailingClient(),
         model="mistral-large-latest",
         max_segments_for_llm=50,
     )
-    assert manifest["status"] in {"auto_merged", "success"}
+    assert manifest["status"] == "auto_merged"
+    assert manifest["method"] == "heuristic_three_plus"
     roles = {seg["role"] for seg in normalized["segments"]}
     assert ROLE_MODERATOR in roles
     assert ROLE_INTERVIEWEE in roles
+
+
+class FakeBatchClient:
+    def __init__(self, mapping: dict[str, str]) -> None:
+        self.mapping = mapping
+        self.input_rows: list[dict[str, object]] = []
+
+    def upload_file(self, *, file_path: Path, purpose: str) -> dict[str, str]:
+        self.input_rows = [json.loads(line) for line in file_path.read_text(encoding="utf-8").splitlines()]
+        return {"id": "file-in"}
+
+    def create_batch_job(self, **_: object) -> dict[str, str]:
+        return {"id": "job-1", "status": "SUCCESS", "output_file": "file-out"}
+
+    def download_file(self, *, file_id: str) -> bytes:
+        content = json.dumps({"mapping": self.mapping})
+        rows = [
+            {"custom_id": row["custom_id"], "response": {"body": {"choices": [{"message": {"content": content}}]}}}
+            for row in self.input_rows
+        ]
+        return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+def test_batch_mapping_results_feed_normalize_transcript_entry(tmp_path: Path) -> None:
+    # No questions at all, so the heuristic merge fails the gate and the model is asked.
+    segments = [
+        {"speaker_id": "A", "text": "Tell me about the weekend.", "start": 0.0, "end": 1.0},
+        {"speaker_id": "B", "text": "I joined the hackathon", "start": 1.0, "end": 2.0},
+        {"speaker_id": "C", "text": "It was intense", "start": 2.0, "end": 3.0},
+    ]
+    transcript = {"language": "en", "segments": segments}
+    mapping = {"A": ROLE_MODERATOR, "B": ROLE_INTERVIEWEE, "C": ROLE_INTERVIEWEE}
+    client = FakeBatchClient(mapping)
+    messages = _llm_mapping_messages(segments=segments, max_segments=50)
+    responses = run_mapping_batch(
+        client,
+        model="mistral-large-latest",
+        requests={_request_key(messages): messages},
+        input_path=tmp_path / "batch.jsonl",
+        poll_interval=5,
+        timeout_seconds=60,
+    )
+
+    normalized, manifest = normalize_transcript_entry(
+        transcript=transcript,
+        client=BatchMappingResults(responses),
+        model="mistral-large-latest",
+        max_segments_for_llm=50,
+    )
+    assert manifest["method"] == "llm"
+    assert normalized["speaker_role_mapping"] == mapping
+
+    _, fallback = normalize_transcript_entry(
+        transcript=transcript,
+        client=BatchMappingResults({}),
+        model="mistral-large-latest",
+        max_segments_for_llm=50,
+    )
+    assert fallback["method"] == "heuristic_fallback"
+
+
+def test_fused_role_stats_match_role_stats() -> None:
+    segments = _segments() + [
+        {"speaker_id": "B", "text": "   ", "start": "bad"},
+        {"speaker_id": None, "text": "Who else?", "start": 5.0},
+    ]
+    mapping = heuristic_mapping(segments)
+    normalized, stats = _map_rows(_analyze(segments)[1], mapping)
+    assert normalized == apply_role_mapping(segments, mapping)
+    assert stats == gate_two_roles(normalized)[2]
+
+
+def test_mapping_payload_is_columnar_and_deduplicated() -> None:
+    segments = _segments() + [
+        {"speaker_id": "B", "text": "I joined the hackathon", "start": 9.0, "end": 10.0},
+        {"speaker_id": "C", "text": "x" * 300, "start": 11.0, "end": 12.0},
+    ]
+    messages = _llm_mapping_messages(segments=segments, max_segments=50)
+    sample = json.loads(messages[1]["content"])["data"]["sample_segments"]
+    assert sample["speaker_ids"] == ["A", "B", "C", "A", "C"]
+    assert sample["starts"] == [0.0, 1.0, 2.0, 3.0, 11.0]
+    assert len(sample["texts"][-1]) == 160
+
+
+class FakePackedClient:
+    def __init__(self) -> None:
+        self.task_counts: list[int] = []
+
+    def chat_json(self, *, messages: list[dict[str, str]], **_: object) -> dict[str, object]:
+        tasks = json.loads(messages[1]["content"])["tasks"]
+        self.task_counts.append(len(tasks))
+        # The last task of every pack goes unanswered.
+        return {
+            "results": [
+                {"id": task["id"], "mapping": {"A": ROLE_MODERATOR, "B": ROLE_INTERVIEWEE}}
+                for task in tasks[:-1]
+            ]
+        }
+
+
+def test_run_mapping_packed_groups_tasks_and_skips_unanswered() -> None:
+    payloads = {
+        f"key{index}": _llm_mapping_prompt_payload(segments=_segments(), max_segments=50)
+        for index in range(3)
+    }
+    client = FakePackedClient()
+    responses = run_mapping_packed(
+        client,  # type: ignore[arg-type]
+        model="mistral-large-latest",
+        payloads=payloads,
+        pack_size=2,
+        workers=1,
+    )
+    assert client.task_counts == [2, 1]
+    assert set(responses) == {"key0"}
+    assert json.loads(responses["key0"])["mapping"]["A"] == ROLE_MODERATOR
+
+
+def test_batch_mapping_results_use_fallback_for_missing_requests() -> None:
+    class FallbackClient:
+        def chat_json(self, **_: object) -> dict[str, object]:
+            return {"mapping": {"A": ROLE_MODERATOR}}
+
+    results = BatchMappingResults({}, fallback=FallbackClient())  # type: ignore[arg-type]
+    messages = _llm_mapping_messages(segments=_segments(), max_segments=50)
+    assert results.chat_json(messages=messages, model="m") == {"mapping": {"A": ROLE_MODERATOR}}
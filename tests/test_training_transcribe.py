@@ -1,8 +1,28 @@
 from __future__ import annotations
 
+import json
+import shutil
 from pathlib import Path
 
-from training.transcribe import normalize_transcription_response
+import pytest
+
+from training import transcribe
+from training.common import MistralAPIError
+from training.transcribe import (
+    _fit_chunk_seconds,
+    _split_audio_chunks,
+    _transcribe_one,
+    normalize_transcription_response,
+)
+
+
+class CountingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def transcribe(self, **_: object) -> dict[str, object]:
+        self.calls += 1
+        return {"text": "Hello", "language": "en", "segments": [{"start": 0.0, "end": 1.0, "text": "Hello"}]}
 
 
 def test_normalize_transcription_response_with_segments() -> None:
@@ -39,3 +59,136 @@ def test_normalize_transcription_response_without_segments() -> None:
     assert len(result["segments"]) == 1
     assert result["segments"][0]["text"] == "Fallback text"
     assert result["segments"][0]["speaker_id"] is None
+
+
+def test_transcribe_one_reuses_cache_for_identical_audio(tmp_path: Path) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    (input_dir / "a.mp3").write_bytes(b"audio")
+    (input_dir / "b.mp3").write_bytes(b"audio")
+    client = CountingClient()
+
+    def run(name: str) -> dict[str, object]:
+        return _transcribe_one(
+            client=client,  # type: ignore[arg-type]
+            input_dir=input_dir,
+            output_dir=tmp_path / "out",
+            audio_path=input_dir / name,
+            model="voxtral-mini-2602",
+            diarize=True,
+            language=None,
+            resume=False,
+            timestamp_granularities=["segment"],
+            max_upload_mb=20,
+            chunk_seconds=900,
+            cache_dir=tmp_path / "cache",
+        )
+
+    assert run("a.mp3")["status"] == "success"
+    assert run("b.mp3")["status"] == "cache_hit"
+    assert client.calls == 1
+    assert (tmp_path / "out" / "b.json").exists()
+    assert (tmp_path / "out" / "raw" / "b.raw.json").exists()
+
+
+def test_split_audio_chunks_runs_one_segmenter_pass(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+
+    def fake_run(cmd: list[str], check: bool) -> None:
+        calls.append(cmd)
+        pattern = cmd[-1]
+        for index in range(3):
+            Path(pattern % index).write_bytes(b"chunk")
+
+    monkeypatch.setattr(transcribe.subprocess, "run", fake_run)
+    chunks, temp_dir = _split_audio_chunks(tmp_path / "talk.mp3", 900)
+    try:
+        assert len(calls) == 1
+        assert [path.name for path, _ in chunks] == ["talk.chunk000.mp3", "talk.chunk001.mp3", "talk.chunk002.mp3"]
+        assert [offset for _, offset in chunks] == [0.0, 900.0, 1800.0]
+    finally:
+        assert temp_dir is not None
+        shutil.rmtree(temp_dir)
+
+
+def test_transcribe_one_keeps_chunk_order_with_parallel_uploads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    audio_path = input_dir / "long.mp3"
+    audio_path.write_bytes(b"x" * (2 * 1024 * 1024))
+    chunk_dir = tmp_path / "chunks"
+    chunk_dir.mkdir()
+    chunk_paths = [(chunk_dir / f"long.chunk{index:03d}.mp3", index * 900.0) for index in range(4)]
+
+    monkeypatch.setattr(transcribe, "_split_audio_chunks", lambda *_: (chunk_paths, chunk_dir))
+
+    class ChunkClient:
+        def transcribe(self, *, audio_file: Path, **_: object) -> dict[str, object]:
+            return {"text": audio_file.name, "segments": [{"start": 1.0, "end": 2.0, "text": audio_file.name}]}
+
+    record = _transcribe_one(
+        client=ChunkClient(),  # type: ignore[arg-type]
+        input_dir=input_dir,
+        output_dir=tmp_path / "out",
+        audio_path=audio_path,
+        model="voxtral-mini-2602",
+        diarize=True,
+        language=None,
+        resume=False,
+        timestamp_granularities=["segment"],
+        max_upload_mb=1,
+        chunk_seconds=900,
+        chunk_concurrency=4,
+    )
+    assert record["chunked"] is True
+    normalized = json.loads((tmp_path / "out" / "long.json").read_text(encoding="utf-8"))
+    assert [seg["text"] for seg in normalized["segments"]] == [path.name for path, _ in chunk_paths]
+    assert [seg["start"] for seg in normalized["segments"]] == [1.0, 901.0, 1801.0, 2701.0]
+
+
+@pytest.mark.parametrize(
+    ("file_size_mb", "duration", "expected"),
+    [
+        (100.0, 1000.0, 160),  # 0.1 MB/s: 16 MB chunks at --max-upload-mb=20
+        (10.0, 10_000.0, 900),  # low bitrate: --chunk-seconds caps it
+        (100.0, 10.0, 60),  # never below a minute
+        (100.0, 0.0, 900),  # unknown duration
+    ],
+)
+def test_fit_chunk_seconds(
+    monkeypatch: pytest.MonkeyPatch, file_size_mb: float, duration: float, expected: int
+) -> None:
+    monkeypatch.setattr(transcribe, "_probe_duration_seconds", lambda _: duration)
+    fitted = _fit_chunk_seconds(Path("a.mp3"), file_size_mb=file_size_mb, max_upload_mb=20, chunk_seconds=900)
+    assert fitted == expected
+
+
+def test_transcribe_one_does_not_chunk_on_auth_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    (input_dir / "a.mp3").write_bytes(b"audio")
+
+    def fail_split(*_: object) -> None:
+        raise AssertionError("auth errors must not fall back to chunking")
+
+    class UnauthorizedClient:
+        def transcribe(self, **_: object) -> dict[str, object]:
+            raise MistralAPIError("Mistral API error status=401", status_code=401)
+
+    monkeypatch.setattr(transcribe, "_split_audio_chunks", fail_split)
+    with pytest.raises(MistralAPIError):
+        _transcribe_one(
+            client=UnauthorizedClient(),  # type: ignore[arg-type]
+            input_dir=input_dir,
+            output_dir=tmp_path / "out",
+            audio_path=input_dir / "a.mp3",
+            model="voxtral-mini-2602",
+            diarize=True,
+            language=None,
+            resume=False,
+            timestamp_granularities=["segment"],
+            max_upload_mb=20,
+            chunk_seconds=900,
+        )
@@ -2,29 +2,31 @@ from __future__ import annotations
 
 import pytest
 
+from _builders import make_evidence, make_proposition
+from _fakes import DummyLLM, InMemoryProjectService
 from api.routes_projects import get_hypothesis_map
 from agents.synthesizer import SynthesizerAgent
-from models.evidence import Evidence
-from models.proposition import Proposition
-from services.project_service import ProjectService
+from models.project import ProjectState
 from services.visualization import build_hypothesis_map
 from services.sse_manager import SSEManager
 
 
-class DummyLLM:
-    async def chat(self, *args, **kwargs):
-        return ""
+@pytest.fixture(scope="module")
+def service() -> InMemoryProjectService:
+    return InMemoryProjectService()
 
-    async def chat_json(self, *args, **kwargs):
-        return {}
 
+@pytest.fixture(scope="module")
+def demo_project(service) -> ProjectState:
+    return service.create_project("demo", "RQ")
 
-def test_build_hypothesis_map_supports_and_contradicts(tmp_path) -> None:
-    service = ProjectService(tmp_path)
-    project = service.create_project("demo", "RQ")
+
+def test_build_hypothesis_map_supports_and_contradicts(demo_project) -> None:
+    # Stores are replaced on a copy; the shared project stays empty for the route test.
+    project = demo_project.model_copy()
 
     project.evidence_store = [
-        Evidence(
+        make_evidence(
             id="E001",
             interview_id="INT_001",
             quote="The team rules were confusing.",
@@ -35,7 +37,7 @@ def test_build_hypothesis_map_supports_and_contradicts(tmp_path) -> None:
             tags=["rules", "team"],
             language="en",
         ),
-        Evidence(
+        make_evidence(
             id="E002",
             interview_id="INT_001",
             quote="Mentors helped us a lot.",
@@ -48,8 +50,7 @@ def test_build_hypothesis_map_supports_and_contradicts(tmp_path) -> None:
         ),
     ]
     project.proposition_store = [
-        Proposition(
-            id="P001",
+        make_proposition(
             factor="Team formation dynamics",
             mechanism="Rules and support quality",
             outcome="Execution quality",
@@ -59,7 +60,6 @@ def test_build_hypothesis_map_supports_and_contradicts(tmp_path) -> None:
             contradicting_evidence=["E001"],
         )
     ]
-    service.save_project(project)
 
     model = build_hypothesis_map(project)
 
@@ -75,12 +75,7 @@ def test_build_hypothesis_map_supports_and_contradicts(tmp_path) -> None:
     assert all("explanation" in edge for edge in model["edges"])
 
 
-@pytest.mark.asyncio
-async def test_hypothesis_map_route_returns_payload(tmp_path) -> None:
-    service = ProjectService(tmp_path)
-    project = service.create_project("demo", "RQ")
-    service.save_project(project)
-
+async def test_hypothesis_map_route_returns_payload(service, demo_project) -> None:
     payload = await get_hypothesis_map(
         "demo",
         project_service=service,
@@ -2,56 +2,64 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+from typing import NamedTuple
+
+import pytest
 
 from services.webhook_security import verify_elevenlabs_signature
 
 
+SECRET = "top-secret"
+
+
+class SignedRequest(NamedTuple):
+    body: bytes
+    timestamp: int
+    header: str
+
+
 def _sign(secret: str, timestamp: int, raw: bytes) -> str:
     payload = f"{timestamp}.{raw.decode('utf-8')}".encode("utf-8")
     digest = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
     return f"t={timestamp},v0={digest}"
 
 
-def test_verify_signature_valid() -> None:
+@pytest.fixture(scope="module")
+def signed_request() -> SignedRequest:
     body = b'{"hello":"world"}'
-    secret = "top-secret"
     timestamp = 1_700_000_000
-    header = _sign(secret, timestamp, body)
+    return SignedRequest(body=body, timestamp=timestamp, header=_sign(SECRET, timestamp, body))
+
 
+def test_verify_signature_valid(signed_request) -> None:
     assert verify_elevenlabs_signature(
-        raw_body=body,
-        signature_header=header,
-        secret=secret,
+        raw_body=signed_request.body,
+        signature_header=signed_request.header,
+        secret=SECRET,
         tolerance_seconds=300,
-        now_ts=timestamp + 60,
+        now_ts=signed_request.timestamp + 60,
     )
 
 
 def test_verify_signature_invalid_digest() -> None:
     body = b'{"hello":"world"}'
-    secret = "top-secret"
     timestamp = 1_700_000_000
     header = f"t={timestamp},v0=deadbeef"
 
     assert not verify_elevenlabs_signature(
         raw_body=body,
         signature_header=header,
-        secret=secret,
+        secret=SECRET,
         tolerance_seconds=300,
         now_ts=timestamp + 60,
     )
 
 
-def test_verify_signature_rejects_old_timestamp() -> None:
-    body = b'{"hello":"world"}'
-    secret = "top-secret"
-    timestamp = 1_700_000_000
-    header = _sign(secret, timestamp, body)
-
+def test_verify_signature_rejects_old_timestamp(signed_request) -> None:
     assert not verify_elevenlabs_signature(
-        raw_body=body,
-        signature_header=header,
-        secret=secret,
+        raw_body=signed_request.body,
+        signature_header=signed_request.header,
+        secret=SECRET,
         tolerance_seconds=300,
-        now_ts=timestamp + 301,
+        now_ts=signed_request.timestamp + 301,
     )
@@ -1,29 +1,44 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any
 
 try:
-    from .common import MistralClient, append_jsonl, get_mistral_config, iter_jsonl, now_iso, write_json
+    from .common import (
+        JsonlWriter,
+        MistralClient,
+        get_mistral_config,
+        iter_jsonl,
+        now_iso,
+        scan_tail_fields,
+        write_json,
+    )
 except ImportError:  # pragma: no cover - direct script execution
     from common import (  # type: ignore
+        JsonlWriter,
         MistralClient,
-        append_jsonl,
         get_mistral_config,
         iter_jsonl,
         now_iso,
+        scan_tail_fields,
         write_json,
     )
 
 
 EMAIL_RE = re.compile(r"\b[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}\b")
-PHONE_RE = re.compile(r"(?<!\w)(?:\+?\d[\d\-\s()]{6,}\d)")
-URL_RE = re.compile(r"\b(?:https?://|www\.)\S+\b", re.IGNORECASE)
+# The phone quantifier is bounded so a long run of digits/punctuation cannot make a
+# single match attempt scan (and backtrack over) the whole text. URL_RE covers the
+# whole non-space token so no tail of a URL is left unredacted.
+PHONE_RE = re.compile(r"(?<!\w)(?:\+?\d[\d\-\s()]{6,64}\d)")
+URL_RE = re.compile(r"\b(?:https?://|www\.)[^\s\x00]+\b", re.IGNORECASE)
 HANDLE_RE = re.compile(r"(?<!\w)@[a-zA-Z0-9_]{3,}")
 LONG_ID_RE = re.compile(r"\b\d{6,}\b")
 
@@ -32,44 +47,136 @@ YANDEX_TERMS = re.compile(
     re.IGNORECASE,
 )
 
-
-def _record_key(record: dict[str, Any]) -> str:
-    source = str(record.get("source_file", "")).strip()
-    turn_index = str(record.get("turn_index", "")).strip()
-    question = str(record.get("good_question", "")).strip()
-    return f"{source}|{turn_index}|{question}"
+# All cleanup patterns fused into one alternation so each text is scanned once;
+# group order matches the old pass order, which decides ties at the same offset.
+_CLEANUP_PATTERNS = (
+    ("email", EMAIL_RE, "[CONTACT]"),
+    ("phone", PHONE_RE, "[CONTACT]"),
+    ("url", URL_RE, "[URL]"),
+    ("handle", HANDLE_RE, "[CONTACT]"),
+    ("long_id", LONG_ID_RE, "[ID]"),
+    ("yandex", YANDEX_TERMS, "[REDACTED_ORG]"),
+)
+_COMBINED = re.compile(
+    "|".join(f"(?P<{name}>{pattern.pattern})" for name, pattern, _ in _CLEANUP_PATTERNS),
+    re.IGNORECASE,
+)
+_REPL = {name: token for name, _, token in _CLEANUP_PATTERNS}
+# Cheap necessary condition for any cleanup pattern to match (every pattern needs
+# "@", a digit, a URL prefix or a Yandex/Alice stem). Most dialogue turns fail it.
+# Joins context turns for a single cleanup scan: not whitespace, not a word char and
+# excluded from URL_RE, so no pattern can match across two turns.
+_TURN_SEP = "\x00"
+_ANY_SIGNAL = re.compile(r"[@\d]|http|www\.|y[aа]|alice|яндекс", re.IGNORECASE)
+
+
+RecordKey = tuple[Any, Any, Any]
+
+
+def _record_key(record: dict[str, Any]) -> RecordKey:
+    # Hashable as-is: values come straight from JSONL, so no str() coercion or joining
+    # per call (this runs for every input row and every row of a resumed output).
+    question = record.get("good_question") or ""
+    return (
+        record.get("source_file") or "",
+        record.get("turn_index", ""),
+        question.strip() if isinstance(question, str) else question,
+    )
 
 
-def _apply_regex_cleanup(text: str) -> str:
-    updated = text
-    updated = EMAIL_RE.sub("[CONTACT]", updated)
-    updated = PHONE_RE.sub("[CONTACT]", updated)
-    updated = URL_RE.sub("[URL]", updated)
-    updated = HANDLE_RE.sub("[CONTACT]", updated)
-    updated = LONG_ID_RE.sub("[ID]", updated)
-    updated = YANDEX_TERMS.sub("[REDACTED_ORG]", updated)
-    return updated.strip()
+_KEY_FIELDS = ("source_file", "turn_index", "good_question")
 
 
-def regex_cleanup_example(record: dict[str, Any]) -> dict[str, Any]:
-    cleaned = dict(record)
+def _iter_output_keys(path: Path) -> Iterator[RecordKey]:
+    # Resume only needs the three key fields, so rows are not fully parsed; any line
+    # the scan cannot read confidently falls back to a full parse.
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            fields = scan_tail_fields(line, _KEY_FIELDS)
+            yield _record_key(fields if fields is not None else json.loads(line))
+
+
+def _key_digest(key: RecordKey) -> bytes:
+    # 16-byte fingerprint kept in the resume set instead of the key itself: a few
+    # dozen bytes per processed record rather than a tuple of three full strings.
+    # Unlike a Bloom filter there are no practical false positives, which here would
+    # silently skip records that were never anonymized.
+    return hashlib.blake2b("\x1f".join(map(str, key)).encode("utf-8"), digest_size=16).digest()
+
+
+def _key_label(key: RecordKey) -> str:
+    # Manifest lines keep the historical "source|turn_index|question" form.
+    return "|".join(str(part).strip() for part in key)
+
+
+def _apply_regex_cleanup(text: str) -> tuple[str, set[str]]:
+    # Returns the redacted text plus pattern kinds still present after redaction.
+    # A text with no matches comes back unchanged, so it cannot leak; only rewritten
+    # texts get a second scan for residual matches.
+    if not _ANY_SIGNAL.search(text):
+        return text.strip(), set()
+    hits = 0
+
+    def replace(match: re.Match[str]) -> str:
+        nonlocal hits
+        hits += 1
+        return _REPL[match.lastgroup]
+
+    cleaned = _COMBINED.sub(replace, text).strip()
+    if not hits:
+        return cleaned, set()
+    return cleaned, {match.lastgroup for match in _COMBINED.finditer(cleaned)}
+
+
+def _cleanup_turns(contents: list[str]) -> tuple[list[str], set[str]]:
+    # All turns go through one scan, joined on a separator that no cleanup pattern
+    # can match or cross. A turn that happens to contain it falls back to per-turn scans.
+    if any(_TURN_SEP in content for content in contents):
+        cleaned: list[str] = []
+        leaks: set[str] = set()
+        for content in contents:
+            text, residual = _apply_regex_cleanup(content)
+            cleaned.append(text)
+            leaks |= residual
+        return cleaned, leaks
+    joined, leaks = _apply_regex_cleanup(_TURN_SEP.join(contents))
+    return [part.strip() for part in joined.split(_TURN_SEP)], leaks
+
+
+def _cleanup_in_place(cleaned: dict[str, Any]) -> list[str]:
+    leaks: set[str] = set()
     context = cleaned.get("context")
     if isinstance(context, list):
-        clean_context: list[dict[str, str]] = []
-        for item in context:
-            if not isinstance(item, dict):
-                continue
-            clean_context.append(
-                {
-                    "role": str(item.get("role", "")).strip().lower(),
-                    "content": _apply_regex_cleanup(str(item.get("content", ""))),
-                }
-            )
-        cleaned["context"] = clean_context
+        turns = [item for item in context if isinstance(item, dict)]
+        contents = [str(item.get("content", "")) for item in turns]
+        contents, residual = _cleanup_turns(contents)
+        leaks |= residual
+        cleaned["context"] = [
+            {
+                "role": str(item.get("role", "")).strip().lower(),
+                "content": content,
+            }
+            for item, content in zip(turns, contents)
+        ]
 
     for field in ("good_question", "improved_question", "technique"):
-        cleaned[field] = _apply_regex_cleanup(str(cleaned.get(field, "")))
-    return cleaned
+        cleaned[field], residual = _apply_regex_cleanup(str(cleaned.get(field, "")))
+        # detect_leaks never looked at technique; keep the drop rule identical.
+        if field != "technique":
+            leaks |= residual
+    return sorted(leaks)
+
+
+def regex_cleanup_with_leaks(record: dict[str, Any]) -> tuple[dict[str, Any], list[str]]:
+    cleaned = dict(record)
+    return cleaned, _cleanup_in_place(cleaned)
+
+
+def regex_cleanup_example(record: dict[str, Any]) -> dict[str, Any]:
+    return regex_cleanup_with_leaks(record)[0]
 
 
 def detect_leaks(record: dict[str, Any]) -> list[str]:
@@ -84,7 +191,7 @@ def detect_leaks(record: dict[str, Any]) -> list[str]:
 
     leaks: set[str] = set()
     for text in texts:
-        if not text:
+        if not text or not _ANY_SIGNAL.search(text):
             continue
         if EMAIL_RE.search(text):
             leaks.add("email")
@@ -135,62 +242,119 @@ def _sanitize_example_shape(raw: dict[str, Any]) -> dict[str, Any] | None:
     }
 
 
+_SYSTEM_PROMPT = (
+    "You anonymize interview training examples. Remove personal data and all Yandex references. "
+    "Keep semantic meaning. Return only JSON object."
+)
+_SANITIZE_RULES = [
+    "Replace personal names with [NAME]",
+    "Replace organizations with [ORG]",
+    "Replace products/services with [PRODUCT]",
+    "Replace locations with [LOCATION]",
+    "Remove contact details and IDs",
+    "Remove all Yandex-related references",
+    "If impossible to sanitize safely, set keep=false",
+]
+_RESULT_SCHEMA = {
+    "keep": True,
+    "drop_reason": "string if keep=false",
+    "example": {
+        "context": [{"role": "user|assistant", "content": "text"}],
+        "good_question": "text",
+        "improved_question": "text",
+        "quality_score": 4,
+        "technique": "echo|why|example|contrast|impact|reframe|silence",
+    },
+}
+_BATCH_MAX_TOKENS = 32768
+# The single-record user message is this fixed JSON prefix plus the serialized
+# record, so only the record is encoded per call and the leading bytes are identical
+# across requests (friendly to provider-side prompt caching).
+_SINGLE_PAYLOAD_PREFIX = json.dumps(
+    {
+        "task": "Sanitize one training example",
+        "rules": _SANITIZE_RULES,
+        "output_schema": _RESULT_SCHEMA,
+    },
+    ensure_ascii=False,
+)[:-1] + ', "input_example": '
+
+AnonymizeResult = tuple[dict[str, Any] | None, dict[str, Any]]
+
+
+def _parse_llm_result(payload: dict[str, Any]) -> tuple[dict[str, Any] | None, str]:
+    keep = bool(payload.get("keep", True))
+    if not keep:
+        return None, str(payload.get("drop_reason", "llm_drop")).strip() or "llm_drop"
+
+    example_raw = payload.get("example")
+    if isinstance(example_raw, dict):
+        clean = _sanitize_example_shape(example_raw)
+    else:
+        clean = _sanitize_example_shape(payload)
+    if clean is None:
+        return None, "invalid_shape"
+
+    return clean, "ok"
+
+
 def anonymize_with_llm(
     *,
     client: MistralClient,
     model: str,
     record: dict[str, Any],
 ) -> tuple[dict[str, Any] | None, str]:
-    system = (
-        "You anonymize interview training examples. Remove personal data and all Yandex references. "
-        "Keep semantic meaning. Return only JSON object."
+    user_content = _SINGLE_PAYLOAD_PREFIX + json.dumps(record, ensure_ascii=False) + "}"
+    payload = client.chat_json(
+        model=model,
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_content},
+        ],
+        temperature=0.0,
+        max_tokens=4096,
     )
+    return _parse_llm_result(payload)
+
+
+def anonymize_batch_with_llm(
+    *,
+    client: MistralClient,
+    model: str,
+    records: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any] | None, str]]:
     user_payload = {
-        "task": "Sanitize one training example",
+        "task": f"Sanitize {len(records)} training examples independently",
         "rules": [
-            "Replace personal names with [NAME]",
-            "Replace organizations with [ORG]",
-            "Replace products/services with [PRODUCT]",
-            "Replace locations with [LOCATION]",
-            "Remove contact details and IDs",
-            "Remove all Yandex-related references",
-            "If impossible to sanitize safely, set keep=false",
+            *_SANITIZE_RULES,
+            "Return exactly one result per input example, in input order",
         ],
-        "input_example": record,
-        "output_schema": {
-            "keep": True,
-            "drop_reason": "string if keep=false",
-            "example": {
-                "context": [{"role": "user|assistant", "content": "text"}],
-                "good_question": "text",
-                "improved_question": "text",
-                "quality_score": 4,
-                "technique": "echo|why|example|contrast|impact|reframe|silence",
-            },
-        },
+        "input_examples": records,
+        "output_schema": {"results": [_RESULT_SCHEMA]},
     }
     payload = client.chat_json(
         model=model,
         messages=[
-            {"role": "system", "content": system},
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
         ],
         temperature=0.0,
-        max_tokens=4096,
+        max_tokens=min(4096 * len(records), _BATCH_MAX_TOKENS),
+        # Batched outputs are long; streaming keeps the connection busy instead of idle.
+        stream=True,
     )
-    keep = bool(payload.get("keep", True))
-    if not keep:
-        return None, str(payload.get("drop_reason", "llm_drop")).strip() or "llm_drop"
-
-    example_raw = payload.get("example")
-    if isinstance(example_raw, dict):
-        clean = _sanitize_example_shape(example_raw)
-    else:
-        clean = _sanitize_example_shape(payload)
-    if clean is None:
-        return None, "invalid_shape"
+    results = payload.get("results")
+    if not isinstance(results, list):
+        results = []
 
-    return clean, "ok"
+    parsed: list[tuple[dict[str, Any] | None, str]] = []
+    for index in range(len(records)):
+        item = results[index] if index < len(results) else None
+        if not isinstance(item, dict):
+            parsed.append((None, "missing_batch_result"))
+            continue
+        parsed.append(_parse_llm_result(item))
+    return parsed
 
 
 def parse_args() -> argparse.Namespace:
@@ -215,6 +379,18 @@ def parse_args() -> argparse.Namespace:
         help="Summary report JSON path",
     )
     parser.add_argument("--limit", type=int, default=0, help="Optional record cap")
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=0,
+        help="Client-side request rate cap shared by all workers (default: unlimited)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Examples sanitized per LLM call (default: 1)",
+    )
     return parser.parse_args()
 
 
@@ -228,57 +404,56 @@ def main() -> int:
     if not input_path.exists():
         raise SystemExit(f"Input file does not exist: {input_path}")
 
-    records = iter_jsonl(input_path)
-    if args.limit > 0:
-        records = records[: args.limit]
-    if not records:
+    records = islice(iter_jsonl(input_path), args.limit if args.limit > 0 else None)
+    first_record = next(records, None)
+    if first_record is None:
         raise SystemExit("Input JSONL has no records")
+    records = chain([first_record], records)
 
-    processed_keys: set[str] = set()
+    processed_keys: set[bytes] = set()
     if args.resume and output_path.exists():
-        for item in iter_jsonl(output_path):
-            processed_keys.add(_record_key(item))
+        processed_keys.update(_key_digest(key) for key in _iter_output_keys(output_path))
 
     api_key, api_base = get_mistral_config()
     workers = max(1, int(args.concurrency))
+    batch_size = max(1, int(args.batch_size))
     print(
-        f"[anonymize] records={len(records)} model={args.model} workers={workers} resume={args.resume}"
+        f"[anonymize] input={input_path.name} limit={args.limit or 'none'} model={args.model} "
+        f"workers={workers} batch_size={batch_size} resume={args.resume}"
     )
 
     counters = {"kept": 0, "dropped": 0, "failed": 0, "skipped_existing": 0}
     dropped_reasons: Counter[str] = Counter()
     leak_counter: Counter[str] = Counter()
+    client = MistralClient(
+        api_key=api_key,
+        api_base=api_base,
+        requests_per_minute=args.requests_per_minute or None,
+    )
 
-    def run(record: dict[str, Any]) -> tuple[dict[str, Any] | None, dict[str, Any]]:
-        key = _record_key(record)
-        if key in processed_keys:
-            return None, {
-                "stage": "anonymize",
-                "status": "skipped_existing",
-                "key": key,
-                "updated_at": now_iso(),
-            }
-
-        client = MistralClient(api_key=api_key, api_base=api_base)
-        sanitized, status = anonymize_with_llm(client=client, model=args.model, record=record)
+    def finish(
+        record: dict[str, Any],
+        key: RecordKey,
+        sanitized: dict[str, Any] | None,
+        status: str,
+    ) -> AnonymizeResult:
         if sanitized is None:
             return None, {
                 "stage": "anonymize",
                 "status": "dropped",
-                "key": key,
+                "key": _key_label(key),
                 "reason": status,
                 "updated_at": now_iso(),
             }
 
-        merged = dict(record)
-        merged.update(sanitized)
-        merged = regex_cleanup_example(merged)
-        leaks = detect_leaks(merged)
+        # One merged copy, cleaned in place; the caller's record is never mutated.
+        merged = {**record, **sanitized}
+        leaks = _cleanup_in_place(merged)
         if leaks:
             return None, {
                 "stage": "anonymize",
                 "status": "dropped",
-                "key": key,
+                "key": _key_label(key),
                 "reason": "leak_after_cleanup",
                 "leaks": leaks,
                 "updated_at": now_iso(),
@@ -288,25 +463,76 @@ def main() -> int:
         return merged, {
             "stage": "anonymize",
             "status": "kept",
-            "key": key,
+            "key": _key_label(key),
             "updated_at": now_iso(),
         }
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_map = {executor.submit(run, record): record for record in records}
-        for future in as_completed(future_map):
-            try:
-                clean_record, manifest = future.result()
-            except Exception as err:  # noqa: BLE001
-                counters["failed"] += 1
-                manifest = {
+    def run(batch: list[dict[str, Any]]) -> list[AnonymizeResult]:
+        results: list[AnonymizeResult | None] = [None] * len(batch)
+        pending: list[tuple[int, dict[str, Any], RecordKey]] = []
+        for index, record in enumerate(batch):
+            key = _record_key(record)
+            if _key_digest(key) in processed_keys:
+                results[index] = None, {
+                    "stage": "anonymize",
+                    "status": "skipped_existing",
+                    "key": _key_label(key),
+                    "updated_at": now_iso(),
+                }
+            else:
+                pending.append((index, record, key))
+
+        try:
+            if len(pending) == 1:
+                outcomes = [anonymize_with_llm(client=client, model=args.model, record=pending[0][1])]
+            elif pending:
+                outcomes = anonymize_batch_with_llm(
+                    client=client,
+                    model=args.model,
+                    records=[record for _, record, _ in pending],
+                )
+            else:
+                outcomes = []
+        except Exception as err:  # noqa: BLE001
+            # Only the records sent to the model failed; skipped ones keep their status.
+            for index, _, key in pending:
+                results[index] = None, {
                     "stage": "anonymize",
                     "status": "failed",
+                    "key": _key_label(key),
                     "error": str(err),
                     "updated_at": now_iso(),
                 }
-                clean_record = None
-            else:
+        else:
+            for (index, record, key), (sanitized, status) in zip(pending, outcomes):
+                results[index] = finish(record, key, sanitized, status)
+        return [result for result in results if result is not None]
+
+    def record_result(
+        future: Future[list[AnonymizeResult]],
+        batch: list[dict[str, Any]],
+        out_writer: JsonlWriter,
+        manifest_writer: JsonlWriter,
+    ) -> None:
+        try:
+            results = future.result()
+        except Exception as err:  # noqa: BLE001
+            counters["failed"] += len(batch)
+            results = [
+                (
+                    None,
+                    {
+                        "stage": "anonymize",
+                        "status": "failed",
+                        "key": _key_label(_record_key(record)),
+                        "error": str(err),
+                        "updated_at": now_iso(),
+                    },
+                )
+                for record in batch
+            ]
+        else:
+            for _, manifest in results:
                 status = str(manifest.get("status", "failed"))
                 if status in counters:
                     counters[status] += 1
@@ -316,9 +542,30 @@ def main() -> int:
                     for leak in manifest.get("leaks", []) if isinstance(manifest.get("leaks"), list) else []:
                         leak_counter[str(leak)] += 1
 
+        for clean_record, manifest in results:
             if clean_record is not None:
-                append_jsonl(output_path, clean_record)
-            append_jsonl(manifest_path, manifest)
+                out_writer.write(clean_record)
+            manifest_writer.write(manifest)
+
+    # Keep at most 2x workers batches in flight so a large input is read and
+    # submitted at the pace it completes, not queued up front.
+    max_inflight = workers * 2
+    batches = iter(lambda: list(islice(records, batch_size)), [])
+    with (
+        client,
+        JsonlWriter(output_path) as out_writer,
+        JsonlWriter(manifest_path) as manifest_writer,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        inflight: dict[Future[list[AnonymizeResult]], list[dict[str, Any]]] = {}
+        for batch in batches:
+            if len(inflight) >= max_inflight:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_result(future, inflight.pop(future), out_writer, manifest_writer)
+            inflight[executor.submit(run, batch)] = batch
+        for future in as_completed(inflight):
+            record_result(future, inflight[future], out_writer, manifest_writer)
 
     report = {
         "created_at": now_iso(),
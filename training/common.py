@@ -2,14 +2,22 @@ from __future__ import annotations
 
 import json
 import os
-import re
+import threading
 import time
+import uuid
+from collections.abc import Iterator
 from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
+
 
 TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
 DEFAULT_AUDIO_EXTENSIONS = {
@@ -27,6 +35,22 @@ DEFAULT_AUDIO_EXTENSIONS = {
 class MistralAPIError(RuntimeError):
     """Raised for non-retriable API errors."""
 
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _json_loads(raw: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps_bytes(item: Any, *, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(item, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(item, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
 
 def now_iso() -> str:
     return datetime.now(UTC).isoformat()
@@ -41,40 +65,141 @@ def ensure_parent(path: Path) -> None:
 
 
 def read_json(path: Path) -> dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return _json_loads(path.read_bytes())
 
 
 def write_json(path: Path, payload: Any) -> None:
+    # Written to a unique temp file and renamed into place, so a crashed worker never
+    # leaves a truncated file that --resume would treat as done.
     ensure_parent(path)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_path.write_bytes(_json_dumps_bytes(payload, indent=True))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def append_jsonl(path: Path, item: Any) -> None:
     ensure_parent(path)
-    with path.open("a", encoding="utf-8") as fh:
-        fh.write(json.dumps(item, ensure_ascii=False))
-        fh.write("\n")
+    with path.open("ab") as fh:
+        fh.write(_json_dumps_bytes(item) + b"\n")
+
+
+class JsonlWriter:
+    """Append-only JSONL writer that keeps the file open for a whole run.
+
+    Encoded lines are collected under a lock and written with ``os.write`` on an
+    ``O_APPEND`` descriptor, so every flush appends whole lines only. The buffer is
+    flushed once it reaches ``buffer_bytes`` or ``flush_interval_seconds`` after
+    the previous flush, so an interrupted run loses little progress.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        flush_interval_seconds: float = 1.0,
+        buffer_bytes: int = 1 << 20,
+    ) -> None:
+        ensure_parent(path)
+        self.path = path
+        self.flush_interval_seconds = flush_interval_seconds
+        self.buffer_bytes = buffer_bytes
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def write(self, item: Any) -> None:
+        line = _json_dumps_bytes(item) + b"\n"
+        with self._lock:
+            self._buffer += line
+            now = time.monotonic()
+            if (
+                len(self._buffer) >= self.buffer_bytes
+                or now - self._last_flush >= self.flush_interval_seconds
+            ):
+                self._flush_locked()
+                self._last_flush = now
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        with memoryview(self._buffer) as view:
+            written = 0
+            while written < len(view):
+                written += os.write(self._fd, view[written:])
+        self._buffer.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd < 0:
+                return
+            try:
+                self._flush_locked()
+            finally:
+                os.close(self._fd)
+                self._fd = -1
+
+    def __enter__(self) -> JsonlWriter:
+        return self
 
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
-def iter_jsonl(path: Path) -> list[dict[str, Any]]:
-    records: list[dict[str, Any]] = []
+
+def iter_jsonl_lines(path: Path) -> Iterator[bytes]:
     if not path.exists():
-        return records
-    with path.open("r", encoding="utf-8") as fh:
+        return
+    with path.open("rb") as fh:
         for line in fh:
             line = line.strip()
-            if not line:
-                continue
-            records.append(json.loads(line))
-    return records
+            if line:
+                yield line
+
+
+def iter_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    for line in iter_jsonl_lines(path):
+        yield _json_loads(line)
+
+
+def load_jsonl(path: Path) -> list[dict[str, Any]]:
+    return list(iter_jsonl(path))
+
+
+def iter_audio_files(directory: Path) -> Iterator[Path]:
+    # Depth-first over name-sorted entries, which yields paths in the same order as
+    # sorting the full list, so callers can stop early (e.g. at --limit).
+    with os.scandir(directory) as scan:
+        entries = sorted(scan, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_audio_files(Path(entry.path))
+        elif os.path.splitext(entry.name)[1].lower() in DEFAULT_AUDIO_EXTENSIONS and entry.is_file():
+            yield Path(entry.path)
 
 
 def collect_audio_files(directory: Path) -> list[Path]:
-    files = [
-        path
-        for path in directory.rglob("*")
-        if path.is_file() and path.suffix.lower() in DEFAULT_AUDIO_EXTENSIONS
-    ]
+    return list(iter_audio_files(directory))
+
+
+def collect_transcript_files(directory: Path) -> list[Path]:
+    # raw/ subtrees are pruned during the walk instead of filtered afterwards, so
+    # their (often large) contents are never listed or stat-ed.
+    files: list[Path] = []
+    stack = [str(directory)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "raw":
+                        stack.append(entry.path)
+                elif entry.name.endswith(".json") and entry.is_file():
+                    files.append(Path(entry.path))
     return sorted(files)
 
 
@@ -88,24 +213,139 @@ def get_mistral_config() -> tuple[str, str]:
     return api_key, api_base.rstrip("/")
 
 
+def json_loads(raw: str | bytes) -> Any:
+    return _json_loads(raw)
+
+
+def json_to_text(item: Any) -> str:
+    return _json_dumps_bytes(item).decode("utf-8")
+
+
 def json_from_text(raw_text: str) -> Any:
     raw_text = raw_text.strip()
     if not raw_text:
         raise ValueError("Empty response")
     try:
-        return json.loads(raw_text)
+        return _json_loads(raw_text)
     except json.JSONDecodeError:
         pass
 
-    for pattern in (r"\{[\s\S]*\}", r"\[[\s\S]*\]"):
-        match = re.search(pattern, raw_text)
-        if not match:
-            continue
+    # Decode the first well-formed value embedded in prose or a code fence, trying
+    # objects before arrays (so "see [1]: {...}" yields the object). raw_decode stops
+    # at the end of the value, so trailing text is ignored and nothing is re-scanned
+    # with a backtracking regex.
+    decoder = json.JSONDecoder()
+    for opener in "{[":
+        start = raw_text.find(opener)
+        while start != -1:
+            try:
+                value, _ = decoder.raw_decode(raw_text, start)
+            except json.JSONDecodeError:
+                start = raw_text.find(opener, start + 1)
+                continue
+            return value
+    raise ValueError("No JSON payload found in text")
+
+
+_TAIL_DECODER = json.JSONDecoder()
+
+
+def scan_tail_fields(line: str, names: tuple[str, ...]) -> dict[str, Any] | None:
+    # Reads top-level fields of a one-line JSON object without parsing all of it. Each
+    # key is searched from the end of the line, so rows that put a long field first are
+    # read only at their short tail. A quoted key followed by ":" cannot occur inside a
+    # JSON string (its quotes would be escaped), so a hit is the real key. None means a
+    # field could not be read confidently and the caller should parse the whole line.
+    fields: dict[str, Any] = {}
+    for name in names:
+        index = line.rfind(f'"{name}"')
+        if index < 0:
+            return None
+        index += len(name) + 2
+        while index < len(line) and line[index] in " \t":
+            index += 1
+        if index >= len(line) or line[index] != ":":
+            return None
+        index += 1
+        while index < len(line) and line[index] in " \t":
+            index += 1
         try:
-            return json.loads(match.group(0))
+            fields[name], _ = _TAIL_DECODER.raw_decode(line, index)
         except json.JSONDecodeError:
-            continue
-    raise ValueError("No JSON payload found in text")
+            return None
+    return fields
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that calls through one client.
+
+    Callers block until a request slot is free instead of all hitting 429 and
+    backing off independently. A caller that has to wait reserves its slot before
+    sleeping, so concurrent waiters queue up rather than waking together.
+    """
+
+    def __init__(self, requests_per_minute: float) -> None:
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return
+            wait_seconds = -self._tokens / self.rate
+        time.sleep(wait_seconds)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    if response.status_code in TRANSIENT_STATUS_CODES:
+        raise httpx.HTTPStatusError(
+            f"Transient error status={response.status_code}",
+            request=response.request,
+            response=response,
+        )
+    if response.status_code >= 400:
+        raise MistralAPIError(
+            f"Mistral API error status={response.status_code}: {response.text}",
+            status_code=response.status_code,
+        )
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts: list[str] = []
+        for item in content:
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, dict) and item.get("type") == "text":
+                parts.append(str(item.get("text", "")))
+        return "".join(parts)
+    return json.dumps(content)
 
 
 class MistralClient:
@@ -117,12 +357,36 @@ class MistralClient:
         timeout_seconds: float = 180.0,
         max_retries: int = 4,
         backoff_seconds: float = 0.8,
+        requests_per_minute: float | None = None,
+        max_connections: int = 64,
+        transport: httpx.BaseTransport | None = None,
     ) -> None:
         self.api_key = api_key
         self.api_base = api_base.rstrip("/")
         self.timeout_seconds = timeout_seconds
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
+        self._limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        # One pooled client for the lifetime of the instance: keep-alive connections are
+        # reused across calls, retries and worker threads instead of re-handshaking each time.
+        self._client = httpx.Client(
+            timeout=self.timeout_seconds,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max(1, max_connections // 2),
+            ),
+            transport=transport,
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> MistralClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def _request(
         self,
@@ -133,44 +397,56 @@ class MistralClient:
         data: Any = None,
         files: Any = None,
     ) -> dict[str, Any]:
-        headers = {"Authorization": f"Bearer {self.api_key}"}
+        response = self._send(method, path, json_payload=json_payload, data=data, files=files)
+        return _json_loads(response.content)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_payload: dict[str, Any] | None = None,
+        data: Any = None,
+        files: Any = None,
+    ) -> httpx.Response:
+        headers: dict[str, str] = {}
+        content: bytes | None = None
         if json_payload is not None:
             headers["Content-Type"] = "application/json"
+            content = _json_dumps_bytes(json_payload)
         url = f"{self.api_base}{path}"
 
         last_error: Exception | None = None
         for attempt in range(1, self.max_retries + 1):
+            if self._limiter is not None:
+                self._limiter.acquire()
             try:
-                with httpx.Client(timeout=self.timeout_seconds) as client:
-                    response = client.request(
-                        method,
-                        url,
-                        headers=headers,
-                        json=json_payload,
-                        data=data,
-                        files=files,
-                    )
-
-                if response.status_code in TRANSIENT_STATUS_CODES:
-                    raise httpx.HTTPStatusError(
-                        f"Transient error status={response.status_code}",
-                        request=response.request,
-                        response=response,
-                    )
-
-                if response.status_code >= 400:
-                    raise MistralAPIError(
-                        f"Mistral API error status={response.status_code}: {response.text}"
-                    )
-                return response.json()
+                response = self._client.request(
+                    method,
+                    url,
+                    headers=headers,
+                    content=content,
+                    data=data,
+                    files=files,
+                )
+
+                _raise_for_status(response)
+                return response
             except (httpx.RequestError, httpx.HTTPStatusError) as err:
                 last_error = err
                 if attempt >= self.max_retries:
                     break
-                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+                time.sleep(self._retry_delay(err, attempt))
 
         raise RuntimeError("Failed to call Mistral API after retries") from last_error
 
+    def _retry_delay(self, err: Exception, attempt: int) -> float:
+        if isinstance(err, httpx.HTTPStatusError):
+            delay = _retry_after_seconds(err.response)
+            if delay is not None:
+                return delay
+        return self.backoff_seconds * (2 ** (attempt - 1))
+
     def chat(
         self,
         *,
@@ -193,18 +469,62 @@ class MistralClient:
         if not choices:
             raise RuntimeError("No choices returned by chat completions")
         message = choices[0].get("message") or {}
-        content = message.get("content", "")
-        if isinstance(content, str):
-            return content
-        if isinstance(content, list):
-            parts: list[str] = []
-            for item in content:
-                if isinstance(item, str):
-                    parts.append(item)
-                elif isinstance(item, dict) and item.get("type") == "text":
-                    parts.append(str(item.get("text", "")))
-            return "".join(parts)
-        return json.dumps(content)
+        return _content_text(message.get("content", ""))
+
+    def chat_stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float = 0.0,
+        max_tokens: int = 4096,
+        response_format: dict[str, Any] | None = None,
+    ) -> str:
+        # Same result as chat(), read from an SSE completion while it is generated.
+        # A connection lost mid-stream is retried from scratch like any transport error.
+        payload: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        if response_format is not None:
+            payload["response_format"] = response_format
+        headers = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+        content = _json_dumps_bytes(payload)
+        url = f"{self.api_base}/chat/completions"
+
+        last_error: Exception | None = None
+        for attempt in range(1, self.max_retries + 1):
+            if self._limiter is not None:
+                self._limiter.acquire()
+            try:
+                with self._client.stream("POST", url, headers=headers, content=content) as response:
+                    if response.status_code >= 400:
+                        response.read()
+                    _raise_for_status(response)
+                    parts: list[str] = []
+                    for line in response.iter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        chunk = _json_loads(data)
+                        for choice in chunk.get("choices") or []:
+                            if choice.get("index", 0) != 0:
+                                continue
+                            delta = choice.get("delta") or {}
+                            parts.append(_content_text(delta.get("content") or ""))
+                    return "".join(parts)
+            except (httpx.RequestError, httpx.HTTPStatusError) as err:
+                last_error = err
+                if attempt >= self.max_retries:
+                    break
+                time.sleep(self._retry_delay(err, attempt))
+
+        raise RuntimeError("Failed to stream from Mistral API after retries") from last_error
 
     def chat_json(
         self,
@@ -213,8 +533,10 @@ class MistralClient:
         messages: list[dict[str, str]],
         temperature: float = 0.0,
         max_tokens: int = 4096,
+        stream: bool = False,
     ) -> dict[str, Any]:
-        text = self.chat(
+        send = self.chat_stream if stream else self.chat
+        text = send(
             model=model,
             messages=messages,
             temperature=temperature,
@@ -267,3 +589,22 @@ class MistralClient:
 
     def get_fine_tuning_job(self, *, job_id: str) -> dict[str, Any]:
         return self._request("GET", f"/fine_tuning/jobs/{job_id}")
+
+    def download_file(self, *, file_id: str) -> bytes:
+        return self._send("GET", f"/files/{file_id}/content").content
+
+    def create_batch_job(
+        self,
+        *,
+        input_file_id: str,
+        model: str,
+        endpoint: str = "/v1/chat/completions",
+        metadata: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {"input_files": [input_file_id], "endpoint": endpoint, "model": model}
+        if metadata:
+            payload["metadata"] = metadata
+        return self._request("POST", "/batch/jobs", json_payload=payload)
+
+    def get_batch_job(self, *, job_id: str) -> dict[str, Any]:
+        return self._request("GET", f"/batch/jobs/{job_id}")
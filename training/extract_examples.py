@@ -1,50 +1,71 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Iterator
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 try:
     from .common import (
+        JsonlWriter,
         MistralClient,
-        append_jsonl,
+        collect_transcript_files,
         get_mistral_config,
-        iter_jsonl,
         json_from_text,
+        json_to_text,
         now_iso,
+        read_json,
+        scan_tail_fields,
+        write_json,
     )
 except ImportError:  # pragma: no cover - direct script execution
     from common import (  # type: ignore
+        JsonlWriter,
         MistralClient,
-        append_jsonl,
+        collect_transcript_files,
         get_mistral_config,
-        iter_jsonl,
         json_from_text,
+        json_to_text,
         now_iso,
+        read_json,
+        scan_tail_fields,
+        write_json,
     )
 
 
-def _iter_transcripts(input_dir: Path) -> list[Path]:
-    files = [path for path in input_dir.rglob("*.json") if path.is_file()]
-    return sorted(path for path in files if "/raw/" not in str(path))
+_MAX_TOKENS = 8192
+_BATCH_MAX_TOKENS = 32768
+_TRAINING_ROLES = {"MODERATOR": "assistant", "INTERVIEWEE": "user"}
+_SOURCE_FIELDS = ("source_file",)
+# Appended to the --prompt-file system prompt for batched calls, whose answer shape
+# differs from the single-transcript `examples` object that prompt describes.
+_BATCH_SYSTEM_SUFFIX = (
+    "\n\n## Batched Input\n"
+    "When the input holds several transcripts under `items`, each with a short `id`, "
+    "extract examples from each item independently and return a JSON object with key "
+    "`examples_by_id` instead of `examples`: it maps every item `id` to that item's "
+    "array of examples in the format above (an empty array when it has none)."
+)
+
+# Lowercased assistant content -> first turn index, plus (index, content) in turn order.
+AssistantIndex = tuple[dict[str, int], list[tuple[int, str]]]
+ExtractResult = tuple[Path, list[dict[str, Any]], dict[str, Any]]
 
 
 def _to_training_turns(segments: list[dict[str, Any]], max_turns: int) -> list[dict[str, str]]:
-    turns: list[dict[str, str]] = []
-    for segment in segments:
-        role = str(segment.get("role", "")).upper()
-        text = str(segment.get("text", "")).strip()
-        if not text:
-            continue
-        if role == "MODERATOR":
-            turns.append({"role": "assistant", "content": text})
-        elif role == "INTERVIEWEE":
-            turns.append({"role": "user", "content": text})
-    if max_turns > 0:
-        return turns[:max_turns]
-    return turns
+    # islice stops reading segments once max_turns turns are built.
+    turns = (
+        {"role": role, "content": text}
+        for segment in segments
+        if (role := _TRAINING_ROLES.get(str(segment.get("role", "")).upper()))
+        and (text := str(segment.get("text", "")).strip())
+    )
+    return list(islice(turns, max_turns if max_turns > 0 else None))
 
 
 def _sanitize_example(raw: dict[str, Any], *, min_quality: int) -> dict[str, Any] | None:
@@ -87,25 +108,135 @@ def _sanitize_example(raw: dict[str, Any], *, min_quality: int) -> dict[str, Any
     }
 
 
-def _find_turn_index(turns: list[dict[str, str]], question: str) -> int:
+def _index_assistant_turns(turns: list[dict[str, str]]) -> AssistantIndex:
+    ordered = [
+        (index, turn["content"].strip().lower()) for index, turn in enumerate(turns) if turn["role"] == "assistant"
+    ]
+    exact: dict[str, int] = {}
+    for index, content in ordered:
+        exact.setdefault(content, index)
+    return exact, ordered
+
+
+def _find_turn_index(
+    turns: list[dict[str, str]],
+    question: str,
+    assistant_index: AssistantIndex | None = None,
+) -> int:
+    # Exact matches are a dict lookup; only misses fall back to the substring scan.
     normalized = question.strip().lower()
     if not normalized:
         return -1
-    for index, turn in enumerate(turns):
-        if turn["role"] != "assistant":
-            continue
-        content = turn["content"].strip().lower()
-        if content == normalized:
-            return index
-    for index, turn in enumerate(turns):
-        if turn["role"] != "assistant":
-            continue
-        content = turn["content"].strip().lower()
+    exact, ordered = assistant_index if assistant_index is not None else _index_assistant_turns(turns)
+    index = exact.get(normalized)
+    if index is not None:
+        return index
+    for index, content in ordered:
         if normalized in content or content in normalized:
             return index
     return -1
 
 
+def _iter_output_sources(path: Path) -> Iterator[str]:
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            fields = scan_tail_fields(line, _SOURCE_FIELDS)
+            source = fields["source_file"] if fields is not None else None
+            if not isinstance(source, str):
+                source = str(json.loads(line).get("source_file", ""))
+            yield source.strip()
+
+
+def _transcript_turns(transcript: dict[str, Any], max_turns: int) -> list[dict[str, str]]:
+    raw_segments = transcript.get("segments")
+    segments = [item for item in raw_segments if isinstance(item, dict)] if isinstance(raw_segments, list) else []
+    return _to_training_turns(segments, max_turns=max_turns)
+
+
+def _collect_examples(
+    items: Any,
+    *,
+    source_file: Path,
+    transcript: dict[str, Any],
+    turns: list[dict[str, str]],
+    min_quality: int,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    # main() resolves transcript paths once up front; source_file is used as given.
+    source = str(source_file)
+    clean_examples: list[dict[str, Any]] = []
+    assistant_index = _index_assistant_turns(turns)
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        clean = _sanitize_example(item, min_quality=min_quality)
+        if clean is None:
+            continue
+
+        clean["source_file"] = source
+        clean["language"] = transcript.get("language")
+        clean["speaker_role"] = "MODERATOR"
+        clean["turn_index"] = _find_turn_index(turns, clean["good_question"], assistant_index)
+        clean["extracted_at"] = now_iso()
+        clean_examples.append(clean)
+
+    manifest = {
+        "stage": "extract_examples",
+        "status": "success",
+        "source_file": source,
+        "turns": len(turns),
+        "examples": len(clean_examples),
+        "updated_at": now_iso(),
+    }
+    return clean_examples, manifest
+
+
+def _max_tokens_for(turns: list[dict[str, str]]) -> int:
+    # Output grows with the number of turns that can yield examples; short transcripts
+    # get a proportionally smaller completion budget.
+    return min(_MAX_TOKENS, 1024 + 128 * len(turns))
+
+
+def _chat_json(client: MistralClient, *, cache_dir: Path | None, **request: Any) -> Any:
+    # Parsed replies are cached under a digest of the full request (model, messages,
+    # temperature, max_tokens), so reruns over unchanged transcripts and prompt skip
+    # the model call; any change to the request is a different key. Only replies that
+    # parse to a JSON object or array are stored, so a truncated or malformed reply is
+    # retried on the next run instead of being replayed.
+    if cache_dir is None:
+        return json_from_text(client.chat_stream(**request))
+    key = hashlib.blake2b(json_to_text(request).encode("utf-8"), digest_size=16).hexdigest()
+    cache_path = cache_dir / key[:2] / f"{key}.json"
+    if cache_path.exists():
+        return read_json(cache_path)
+    parsed = json_from_text(client.chat_stream(**request))
+    if isinstance(parsed, (dict, list)):
+        write_json(cache_path, parsed)
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def _instructions_prefix(min_quality: int, *, batched: bool) -> str:
+    # Opening of the user JSON object, up to and including the comma after the fixed
+    # instruction block. It leads every request so consecutive calls share the longest
+    # byte prefix (friendly to provider-side prompt caching); callers append the
+    # per-file fields and the closing brace.
+    if batched:
+        instructions: dict[str, Any] = {
+            "task": "Extract examples from each item's transcript independently",
+            "output": {"examples_by_id": {"<item id>": "array of extracted training examples"}},
+            "min_quality_score": min_quality,
+        }
+    else:
+        instructions = {
+            "output": {"examples": "array of extracted training examples"},
+            "min_quality_score": min_quality,
+        }
+    return json_to_text({"instructions": instructions})[:-1] + ","
+
+
 def _extract_with_model(
     *,
     client: MistralClient,
@@ -115,31 +246,30 @@ def _extract_with_model(
     transcript: dict[str, Any],
     min_quality: int,
     max_turns: int,
+    cache_dir: Path | None = None,
 ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
-    raw_segments = transcript.get("segments")
-    segments = [item for item in raw_segments if isinstance(item, dict)] if isinstance(raw_segments, list) else []
-    turns = _to_training_turns(segments, max_turns=max_turns)
-
-    user_payload = {
-        "source_file": str(source_file),
-        "language": transcript.get("language"),
-        "conversation_turns": turns,
-        "instructions": {
-            "output": {"examples": "array of extracted training examples"},
-            "min_quality_score": min_quality,
-        },
-    }
+    turns = _transcript_turns(transcript, max_turns)
+
+    # The instruction block is serialized once per run (see _instructions_prefix) and
+    # the per-file fields are appended to it, so only the transcript is encoded here.
+    user_content = (
+        _instructions_prefix(min_quality, batched=False)
+        + f'"language":{json_to_text(transcript.get("language"))}'
+        + f',"conversation_turns":{json_to_text(turns)}'
+        + f',"source_file":{json_to_text(str(source_file))}}}'
+    )
 
-    raw_text = client.chat(
+    parsed = _chat_json(
+        client,
+        cache_dir=cache_dir,
         model=model,
         messages=[
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
+            {"role": "user", "content": user_content},
         ],
         temperature=0.1,
-        max_tokens=8192,
+        max_tokens=_max_tokens_for(turns),
     )
-    parsed = json_from_text(raw_text)
     if isinstance(parsed, dict):
         items = parsed.get("examples", [])
     elif isinstance(parsed, list):
@@ -147,30 +277,97 @@ def _extract_with_model(
     else:
         items = []
 
-    clean_examples: list[dict[str, Any]] = []
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-        clean = _sanitize_example(item, min_quality=min_quality)
-        if clean is None:
+    return _collect_examples(
+        items,
+        source_file=source_file,
+        transcript=transcript,
+        turns=turns,
+        min_quality=min_quality,
+    )
+
+
+def _extract_batch_with_model(
+    *,
+    client: MistralClient,
+    model: str,
+    system_prompt: str,
+    batch: list[tuple[Path, dict[str, Any]]],
+    min_quality: int,
+    max_turns: int,
+    cache_dir: Path | None = None,
+) -> list[tuple[list[dict[str, Any]], dict[str, Any]]]:
+    # Items are keyed by their position rather than the source path, which the model
+    # would have to echo back byte for byte.
+    turns_by_source = [_transcript_turns(transcript, max_turns) for _, transcript in batch]
+    items = [
+        {
+            "id": str(index),
+            "language": transcript.get("language"),
+            "conversation_turns": turns,
+        }
+        for index, ((_, transcript), turns) in enumerate(zip(batch, turns_by_source))
+    ]
+    user_content = _instructions_prefix(min_quality, batched=True) + f'"items":{json_to_text(items)}}}'
+
+    parsed = _chat_json(
+        client,
+        cache_dir=cache_dir,
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt + _BATCH_SYSTEM_SUFFIX},
+            {"role": "user", "content": user_content},
+        ],
+        temperature=0.1,
+        max_tokens=min(sum(map(_max_tokens_for, turns_by_source)), _BATCH_MAX_TOKENS),
+    )
+    by_id = parsed.get("examples_by_id") if isinstance(parsed, dict) else None
+    if not isinstance(by_id, dict):
+        by_id = {}
+
+    # A transcript the answer does not cover falls back to its own request.
+    results: list[tuple[list[dict[str, Any]], dict[str, Any]]] = []
+    for index, ((source_file, transcript), turns) in enumerate(zip(batch, turns_by_source)):
+        answer = by_id.get(str(index))
+        if isinstance(answer, list):
+            results.append(
+                _collect_examples(
+                    answer,
+                    source_file=source_file,
+                    transcript=transcript,
+                    turns=turns,
+                    min_quality=min_quality,
+                )
+            )
             continue
+        results.append(
+            _extract_with_model(
+                client=client,
+                model=model,
+                system_prompt=system_prompt,
+                source_file=source_file,
+                transcript=transcript,
+                min_quality=min_quality,
+                max_turns=max_turns,
+                cache_dir=cache_dir,
+            )
+        )
+    return results
 
-        clean["source_file"] = str(source_file.resolve())
-        clean["language"] = transcript.get("language")
-        clean["speaker_role"] = "MODERATOR"
-        clean["turn_index"] = _find_turn_index(turns, clean["good_question"])
-        clean["extracted_at"] = now_iso()
-        clean_examples.append(clean)
 
-    manifest = {
-        "stage": "extract_examples",
-        "status": "success",
-        "source_file": str(source_file.resolve()),
-        "turns": len(turns),
-        "examples": len(clean_examples),
-        "updated_at": now_iso(),
-    }
-    return clean_examples, manifest
+def _batch_transcripts(paths: list[Path], *, batch_size: int, token_budget: int) -> Iterator[list[Path]]:
+    # File size stands in for prompt size (about 4 bytes per token), so batches are
+    # formed without reading transcripts up front.
+    current: list[Path] = []
+    current_tokens = 0
+    for path in paths:
+        tokens = path.stat().st_size // 4
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            yield current
+            current, current_tokens = [], 0
+        current.append(path)
+        current_tokens += tokens
+    if current:
+        yield current
 
 
 def parse_args() -> argparse.Namespace:
@@ -197,6 +394,23 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--limit", type=int, default=0, help="Optional file cap")
     parser.add_argument("--max-turns", type=int, default=500, help="Max turns sent to model per transcript")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Max transcripts per model call (default: 1)",
+    )
+    parser.add_argument(
+        "--batch-token-budget",
+        type=int,
+        default=24000,
+        help="Approximate input token cap per batched call, estimated from file size",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="Optional directory caching parsed model replies across runs (off by default)",
+    )
     return parser.parse_args()
 
 
@@ -216,13 +430,16 @@ def main() -> int:
     input_dir = Path(args.input_dir).expanduser().resolve()
     output_path = Path(args.output).expanduser().resolve()
     manifest_path = Path(args.manifest).expanduser().resolve()
+    cache_dir = Path(args.cache_dir).expanduser().resolve() if args.cache_dir else None
 
     if not input_dir.exists():
         raise SystemExit(f"Input directory does not exist: {input_dir}")
 
-    transcripts = _iter_transcripts(input_dir)
+    transcripts = collect_transcript_files(input_dir)
     if args.limit > 0:
         transcripts = transcripts[: args.limit]
+    # Resolved once here; source_file values, resume checks and manifests reuse it.
+    transcripts = [path.resolve() for path in transcripts]
     if not transcripts:
         raise SystemExit("No transcript files found")
 
@@ -230,69 +447,128 @@ def main() -> int:
     api_key, api_base = get_mistral_config()
     workers = max(1, int(args.concurrency))
 
-    skip_sources: set[str] = set()
+    # Already extracted transcripts are dropped before batching, so resume never
+    # spends a worker slot on them.
+    skipped: list[Path] = []
     if args.resume and output_path.exists():
-        for row in iter_jsonl(output_path):
-            source = str(row.get("source_file", "")).strip()
-            if source:
-                skip_sources.add(source)
+        skip_sources = set(_iter_output_sources(output_path))
+        skip_sources.discard("")
+        pending_paths: list[Path] = []
+        for path in transcripts:
+            (skipped if str(path) in skip_sources else pending_paths).append(path)
+        transcripts = pending_paths
 
     print(
         f"[extract_examples] transcripts={len(transcripts)} model={args.model} "
-        f"workers={workers} min_quality={args.min_quality} resume={args.resume}"
+        f"workers={workers} min_quality={args.min_quality} batch_size={args.batch_size} "
+        f"resume={args.resume} skipped_existing={len(skipped)}"
     )
 
-    counters = {"success": 0, "failed": 0, "skipped_existing": 0, "examples": 0}
-
-    def run(path: Path) -> tuple[list[dict[str, Any]], dict[str, Any]]:
-        if str(path.resolve()) in skip_sources:
-            return [], {
-                "stage": "extract_examples",
-                "status": "skipped_existing",
-                "source_file": str(path.resolve()),
-                "updated_at": now_iso(),
-            }
-        transcript = json.loads(path.read_text(encoding="utf-8"))
-        client = MistralClient(api_key=api_key, api_base=api_base)
-        return _extract_with_model(
-            client=client,
-            model=args.model,
-            system_prompt=prompt,
-            source_file=path,
-            transcript=transcript,
-            min_quality=max(1, int(args.min_quality)),
-            max_turns=max(50, int(args.max_turns)),
-        )
+    counters = {"success": 0, "failed": 0, "skipped_existing": len(skipped), "examples": 0}
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_map = {executor.submit(run, path): path for path in transcripts}
-        for future in as_completed(future_map):
-            path = future_map[future]
-            try:
-                examples, record = future.result()
-            except Exception as err:  # noqa: BLE001
-                counters["failed"] += 1
-                record = {
-                    "stage": "extract_examples",
-                    "status": "failed",
-                    "source_file": str(path.resolve()),
-                    "error": str(err),
-                    "updated_at": now_iso(),
-                }
+    min_quality = max(1, int(args.min_quality))
+    max_turns = max(50, int(args.max_turns))
+    batches = _batch_transcripts(
+        transcripts,
+        batch_size=max(1, int(args.batch_size)),
+        token_budget=max(1, int(args.batch_token_budget)),
+    )
+
+    # One pooled client shared by all workers (httpx.Client is thread-safe).
+    client = MistralClient(api_key=api_key, api_base=api_base, max_connections=workers * 2)
+
+    def run(batch: list[Path]) -> list[ExtractResult]:
+        pending = [(path, read_json(path)) for path in batch]
+        if len(pending) == 1:
+            path, transcript = pending[0]
+            outcomes = [
+                _extract_with_model(
+                    client=client,
+                    model=args.model,
+                    system_prompt=prompt,
+                    source_file=path,
+                    transcript=transcript,
+                    min_quality=min_quality,
+                    max_turns=max_turns,
+                    cache_dir=cache_dir,
+                )
+            ]
+        else:
+            outcomes = _extract_batch_with_model(
+                client=client,
+                model=args.model,
+                system_prompt=prompt,
+                batch=pending,
+                min_quality=min_quality,
+                max_turns=max_turns,
+                cache_dir=cache_dir,
+            )
+        return [(path, examples, record) for (path, _), (examples, record) in zip(pending, outcomes)]
+
+    def record_result(
+        future: Future[list[ExtractResult]],
+        batch: list[Path],
+        out_writer: JsonlWriter,
+        manifest_writer: JsonlWriter,
+    ) -> None:
+        try:
+            results = future.result()
+        except Exception as err:  # noqa: BLE001
+            counters["failed"] += len(batch)
+            results = []
+            for path in batch:
+                results.append(
+                    (
+                        path,
+                        [],
+                        {
+                            "stage": "extract_examples",
+                            "status": "failed",
+                            "source_file": str(path),
+                            "error": str(err),
+                            "updated_at": now_iso(),
+                        },
+                    )
+                )
                 print(f"[extract_examples] failed: {path.name} -> {err}")
-                examples = []
-            else:
-                status = str(record.get("status", "success"))
-                if status == "skipped_existing":
-                    counters["skipped_existing"] += 1
-                else:
-                    counters["success"] += 1
-                print(f"[extract_examples] {status}: {path.name} examples={len(examples)}")
+        else:
+            for path, examples, record in results:
+                counters["success"] += 1
+                print(f"[extract_examples] {record['status']}: {path.name} examples={len(examples)}")
 
+        for _, examples, record in results:
             for item in examples:
-                append_jsonl(output_path, item)
+                out_writer.write(item)
             counters["examples"] += len(examples)
-            append_jsonl(manifest_path, record)
+            manifest_writer.write(record)
+
+    # Keep at most 2x workers batches in flight so transcripts are read and
+    # submitted at the pace they complete, not queued up front.
+    max_inflight = workers * 2
+    with (
+        client,
+        JsonlWriter(output_path) as out_writer,
+        JsonlWriter(manifest_path) as manifest_writer,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        for path in skipped:
+            manifest_writer.write(
+                {
+                    "stage": "extract_examples",
+                    "status": "skipped_existing",
+                    "source_file": str(path),
+                    "updated_at": now_iso(),
+                }
+            )
+        inflight: dict[Future[list[ExtractResult]], list[Path]] = {}
+        for batch in batches:
+            if len(inflight) >= max_inflight:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_result(future, inflight.pop(future), out_writer, manifest_writer)
+            inflight[executor.submit(run, batch)] = batch
+        for future in as_completed(inflight):
+            record_result(future, inflight[future], out_writer, manifest_writer)
 
     print(
         "[extract_examples] done "
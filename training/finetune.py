@@ -12,6 +12,7 @@ except ImportError:  # pragma: no cover - direct script execution
 
 
 FINAL_STATUSES = {"SUCCESS", "FAILED", "CANCELLED", "FAILED_VALIDATION"}
+MIN_POLL_SECONDS = 5
 
 
 def parse_args() -> argparse.Namespace:
@@ -54,6 +55,13 @@ def _build_hyperparameters(args: argparse.Namespace) -> dict[str, Any]:
     return params
 
 
+def _next_poll_delay(delay: float, *, interval: float, status_changed: bool) -> float:
+    # Poll quickly right after a status transition, then back off to --poll-interval.
+    if status_changed:
+        return MIN_POLL_SECONDS
+    return min(interval, delay * 2)
+
+
 def main() -> int:
     args = parse_args()
     data_path = Path(args.data).expanduser().resolve()
@@ -115,11 +123,13 @@ def main() -> int:
     artifact["status"] = str(started.get("status", "STARTED"))
 
     if args.poll:
-        interval = max(5, int(args.poll_interval))
+        interval = max(MIN_POLL_SECONDS, int(args.poll_interval))
         timeout_seconds = max(1, int(args.timeout_minutes)) * 60
         deadline = time.time() + timeout_seconds
         polls: list[dict[str, Any]] = []
-        print(f"[finetune] polling every {interval}s up to {args.timeout_minutes}m")
+        print(f"[finetune] polling every {MIN_POLL_SECONDS}-{interval}s up to {args.timeout_minutes}m")
+        delay: float = MIN_POLL_SECONDS
+        last_status: str | None = None
         while True:
             snapshot = client.get_fine_tuning_job(job_id=job_id)
             status = str(snapshot.get("status", "")).upper()
@@ -140,7 +150,9 @@ def main() -> int:
                 artifact["status"] = "TIMEOUT"
                 artifact["final_job"] = snapshot
                 break
-            time.sleep(interval)
+            delay = _next_poll_delay(delay, interval=interval, status_changed=status != last_status)
+            last_status = status
+            time.sleep(min(delay, max(0.0, deadline - time.time())))
         artifact["polls"] = polls
 
     write_json(output_path, artifact)
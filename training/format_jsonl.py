@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import argparse
-import json
-import math
+import hashlib
+import os
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 try:
-    from .common import iter_jsonl, now_iso, write_json
+    from .common import JsonlWriter, iter_jsonl_lines, json_loads, now_iso, write_json
 except ImportError:  # pragma: no cover - direct script execution
-    from common import iter_jsonl, now_iso, write_json  # type: ignore
+    from common import JsonlWriter, iter_jsonl_lines, json_loads, now_iso, write_json  # type: ignore
 
 
 TRAINING_PRICE_PER_MILLION_USD = {
@@ -17,29 +22,27 @@ TRAINING_PRICE_PER_MILLION_USD = {
     "mistral-medium-latest": 2.0,
 }
 
+# _normalize_record only keeps "user" and "assistant" turns.
+_ROLE_PREFIX = {"user": "Respondent", "assistant": "Interviewer"}
+_USER_MESSAGE_HEADER = "Conversation context from a qualitative interview:\n\n"
+_USER_MESSAGE_FOOTER = (
+    "\n\nTask: produce the next best open-ended probing interview question.\n"
+    "Do not add explanations."
+)
+_CHUNK_ROWS = 10_000
+
+# (sample, dedup digest, user chars, target chars), or None for a dropped row.
+FormattedRow = tuple[dict[str, Any], bytes, int, int] | None
+
 
 def _estimate_tokens(text: str) -> int:
     # Coarse approximation for budgeting.
-    return max(1, math.ceil(len(text) / 4))
+    return max(1, (len(text) + 3) // 4)
 
 
 def _context_to_user_message(context: list[dict[str, str]]) -> str:
-    lines = [
-        "Conversation context from a qualitative interview:",
-        "",
-    ]
-    for turn in context:
-        role = turn["role"]
-        prefix = "Respondent" if role == "user" else "Interviewer"
-        lines.append(f"{prefix}: {turn['content']}")
-    lines.extend(
-        [
-            "",
-            "Task: produce the next best open-ended probing interview question.",
-            "Do not add explanations.",
-        ]
-    )
-    return "\n".join(lines)
+    body = "\n".join(f"{_ROLE_PREFIX[turn['role']]}: {turn['content']}" for turn in context)
+    return _USER_MESSAGE_HEADER + body + _USER_MESSAGE_FOOTER
 
 
 def _normalize_record(
@@ -84,6 +87,23 @@ def _normalize_record(
     }
 
 
+def _format_chunk(lines: list[bytes], *, target_field: str, min_quality: int) -> list[FormattedRow]:
+    # Parsing, normalization and hashing run here (possibly in a worker process);
+    # dedup against earlier chunks and all writes stay in main() so output order and
+    # counts do not depend on --workers.
+    results: list[FormattedRow] = []
+    for line in lines:
+        sample = _normalize_record(json_loads(line), target_field=target_field, min_quality=min_quality)
+        if sample is None:
+            results.append(None)
+            continue
+        user_text = str(sample["messages"][0]["content"])
+        target_text = str(sample["messages"][1]["content"])
+        fingerprint = hashlib.blake2b(f"{user_text}\n---\n{target_text}".encode("utf-8"), digest_size=16).digest()
+        results.append((sample, fingerprint, len(user_text), len(target_text)))
+    return results
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Format anonymized examples for Mistral fine-tuning")
     parser.add_argument("--input", required=True, help="Input JSONL with anonymized examples")
@@ -106,6 +126,12 @@ def parse_args() -> argparse.Namespace:
         help="Model used for rough training cost estimate",
     )
     parser.add_argument("--limit", type=int, default=0, help="Optional input record cap")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to parse and normalize records (default: 1, in-process)",
+    )
     return parser.parse_args()
 
 
@@ -118,50 +144,76 @@ def main() -> int:
     if not input_path.exists():
         raise SystemExit(f"Input file does not exist: {input_path}")
 
-    rows = iter_jsonl(input_path)
+    lines = iter_jsonl_lines(input_path)
     if args.limit > 0:
-        rows = rows[: args.limit]
-    if not rows:
-        raise SystemExit("Input JSONL has no records")
-
-    formatted: list[dict[str, Any]] = []
+        lines = islice(lines, args.limit)
+    chunks = iter(lambda: list(islice(lines, _CHUNK_ROWS)), [])
+    target_field = args.target_field
+    min_quality = max(1, int(args.min_quality))
+    workers = max(1, int(args.workers))
+
+    records_input = 0
+    records_output = 0
     dropped = 0
-    unique_fingerprints: set[str] = set()
+    # 16-byte digests instead of the full "context---target" text keep the dedup set
+    # small on large datasets.
+    unique_fingerprints: set[bytes] = set()
 
     total_context_chars = 0
     total_target_chars = 0
     total_estimated_tokens = 0
 
-    for row in rows:
-        sample = _normalize_record(
-            row,
-            target_field=args.target_field,
-            min_quality=max(1, int(args.min_quality)),
-        )
-        if sample is None:
-            dropped += 1
-            continue
-
-        user_text = str(sample["messages"][0]["content"])
-        target_text = str(sample["messages"][1]["content"])
-        fingerprint = f"{user_text}\n---\n{target_text}"
-        if fingerprint in unique_fingerprints:
-            continue
-        unique_fingerprints.add(fingerprint)
-
-        total_context_chars += len(user_text)
-        total_target_chars += len(target_text)
-        total_estimated_tokens += _estimate_tokens(user_text) + _estimate_tokens(target_text)
-        formatted.append(sample)
-
-    if not formatted:
-        raise SystemExit("No records passed formatting filters")
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        for row in formatted:
-            fh.write(json.dumps(row, ensure_ascii=False))
-            fh.write("\n")
+    def formatted_chunks() -> Iterator[list[FormattedRow]]:
+        if workers == 1:
+            for chunk in chunks:
+                yield _format_chunk(chunk, target_field=target_field, min_quality=min_quality)
+            return
+        # At most 2x workers chunks in flight, collected in submission order.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            inflight: deque[Future[list[FormattedRow]]] = deque()
+            for chunk in chunks:
+                if len(inflight) >= workers * 2:
+                    yield inflight.popleft().result()
+                inflight.append(
+                    executor.submit(_format_chunk, chunk, target_field=target_field, min_quality=min_quality)
+                )
+            while inflight:
+                yield inflight.popleft().result()
+
+    # Records are formatted and written in one pass so memory stays flat on large inputs.
+    # They go to a temp file next to the output that replaces the previous dataset only
+    # after the run completed and passed the checks below.
+    tmp_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with JsonlWriter(tmp_path) as out_writer:
+            for results in formatted_chunks():
+                for result in results:
+                    records_input += 1
+                    if result is None:
+                        dropped += 1
+                        continue
+
+                    sample, fingerprint, user_chars, target_chars = result
+                    if fingerprint in unique_fingerprints:
+                        continue
+                    unique_fingerprints.add(fingerprint)
+
+                    # Same ceil(chars/4) estimate as _estimate_tokens, inlined for the hot
+                    # loop; both texts are non-empty here.
+                    total_context_chars += user_chars
+                    total_target_chars += target_chars
+                    total_estimated_tokens += (user_chars + 3) // 4 + (target_chars + 3) // 4
+                    out_writer.write(sample)
+                    records_output += 1
+
+        if not records_input:
+            raise SystemExit("Input JSONL has no records")
+        if not records_output:
+            raise SystemExit("No records passed formatting filters")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, output_path)
 
     training_cost_per_million = TRAINING_PRICE_PER_MILLION_USD.get(args.estimate_model)
     estimated_cost = None
@@ -174,10 +226,10 @@ def main() -> int:
         "output_path": str(output_path),
         "target_field": args.target_field,
         "estimate_model": args.estimate_model,
-        "records_input": len(rows),
-        "records_output": len(formatted),
+        "records_input": records_input,
+        "records_output": records_output,
         "records_dropped": dropped,
-        "records_deduplicated": len(rows) - dropped - len(formatted),
+        "records_deduplicated": records_input - dropped - records_output,
         "chars_context_total": total_context_chars,
         "chars_target_total": total_target_chars,
         "estimated_tokens_total": total_estimated_tokens,
@@ -188,7 +240,7 @@ def main() -> int:
     write_json(stats_path, stats)
     print(
         "[format_jsonl] done "
-        f"input={len(rows)} output={len(formatted)} dropped={dropped} "
+        f"input={records_input} output={records_output} dropped={dropped} "
         f"estimated_tokens={total_estimated_tokens}"
     )
     return 0
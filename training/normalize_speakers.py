@@ -1,27 +1,40 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
 try:
     from .common import (
+        JsonlWriter,
         MistralClient,
-        append_jsonl,
+        collect_transcript_files,
         ensure_parent,
         get_mistral_config,
+        json_from_text,
+        json_loads,
+        json_to_text,
         now_iso,
+        read_json,
         write_json,
     )
 except ImportError:  # pragma: no cover - direct script execution
     from common import (  # type: ignore
+        JsonlWriter,
         MistralClient,
-        append_jsonl,
+        collect_transcript_files,
         ensure_parent,
         get_mistral_config,
+        json_from_text,
+        json_loads,
+        json_to_text,
         now_iso,
+        read_json,
         write_json,
     )
 
@@ -29,6 +42,11 @@ except ImportError:  # pragma: no cover - direct script execution
 ROLE_MODERATOR = "MODERATOR"
 ROLE_INTERVIEWEE = "INTERVIEWEE"
 VALID_ROLES = {ROLE_MODERATOR, ROLE_INTERVIEWEE}
+MAPPING_MAX_TOKENS = 2048
+BATCH_MIN_POLL_SECONDS = 5
+BATCH_FINAL_STATUSES = {"SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"}
+# Upper bound on the per-file data packed into one chat request (~16k tokens).
+PACK_MAX_CHARS = 64_000
 
 
 def question_ratio(texts: list[str]) -> float:
@@ -38,27 +56,55 @@ def question_ratio(texts: list[str]) -> float:
     return question_count / max(1, len(texts))
 
 
-def _speaker_stats(segments: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+# (index, start, end, speaker_id, text, has_question) for a segment with text.
+SegmentRow = tuple[int, float, float, str, str, bool]
+RoleStats = dict[str, dict[str, float | int]]
+
+
+def _analyze(segments: list[dict[str, Any]]) -> tuple[dict[str, dict[str, Any]], list[SegmentRow]]:
+    # Single pass over the segments: per-speaker stats plus the cleaned rows that
+    # the role mapping is applied to once it is known.
     stats: dict[str, dict[str, Any]] = {}
+    rows: list[SegmentRow] = []
     for index, segment in enumerate(segments):
         speaker = str(segment.get("speaker_id") or "unknown")
         text = str(segment.get("text", "")).strip()
-        entry = stats.setdefault(
-            speaker,
-            {"speaker_id": speaker, "turns": 0, "chars": 0, "question_turns": 0, "first_index": index},
-        )
+        has_question = "?" in text
+        entry = stats.get(speaker)
+        if entry is None:
+            entry = stats[speaker] = {
+                "speaker_id": speaker,
+                "turns": 0,
+                "chars": 0,
+                "question_turns": 0,
+                "first_index": index,
+            }
         entry["turns"] += 1
         entry["chars"] += len(text)
-        if "?" in text:
+        if has_question:
             entry["question_turns"] += 1
+        if not text:
+            continue
+        try:
+            start = float(segment.get("start", 0.0))
+        except (TypeError, ValueError):
+            start = 0.0
+        try:
+            end = float(segment.get("end", start))
+        except (TypeError, ValueError):
+            end = start
+        rows.append((index, start, end, speaker, text, has_question))
     for value in stats.values():
         turns = max(1, int(value["turns"]))
         value["question_ratio"] = float(value["question_turns"]) / turns
-    return stats
+    return stats, rows
 
 
-def heuristic_mapping(segments: list[dict[str, Any]]) -> dict[str, str]:
-    stats = _speaker_stats(segments)
+def _speaker_stats(segments: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    return _analyze(segments)[0]
+
+
+def _heuristic_from_stats(stats: dict[str, dict[str, Any]]) -> dict[str, str]:
     speakers = list(stats)
     if not speakers:
         return {}
@@ -76,25 +122,17 @@ def heuristic_mapping(segments: list[dict[str, Any]]) -> dict[str, str]:
     return mapping
 
 
-def apply_role_mapping(
-    segments: list[dict[str, Any]], mapping: dict[str, str]
-) -> list[dict[str, Any]]:
+def heuristic_mapping(segments: list[dict[str, Any]]) -> dict[str, str]:
+    return _heuristic_from_stats(_speaker_stats(segments))
+
+
+def _map_rows(rows: list[SegmentRow], mapping: dict[str, str]) -> tuple[list[dict[str, Any]], RoleStats]:
+    # Builds the normalized segments and their per-role stats (as role_stats would
+    # compute them) in the same pass.
+    totals = {ROLE_MODERATOR: [0, 0, 0], ROLE_INTERVIEWEE: [0, 0, 0]}
     normalized: list[dict[str, Any]] = []
-    for index, segment in enumerate(segments):
-        speaker_id = str(segment.get("speaker_id") or "unknown")
+    for index, start, end, speaker_id, text, has_question in rows:
         role = mapping.get(speaker_id, ROLE_INTERVIEWEE)
-        text = str(segment.get("text", "")).strip()
-        if not text:
-            continue
-        try:
-            start = float(segment.get("start", 0.0))
-        except (TypeError, ValueError):
-            start = 0.0
-        try:
-            end = float(segment.get("end", start))
-        except (TypeError, ValueError):
-            end = start
-
         normalized.append(
             {
                 "index": index,
@@ -105,10 +143,30 @@ def apply_role_mapping(
                 "text": text,
             }
         )
-    return normalized
+        total = totals.get(role)
+        if total is not None:
+            total[0] += 1
+            total[1] += len(text)
+            total[2] += has_question
+    stats: RoleStats = {
+        role: {
+            "turns": turns,
+            "chars": chars,
+            "question_turns": questions,
+            "question_ratio": (questions / turns) if turns else 0.0,
+        }
+        for role, (turns, chars, questions) in totals.items()
+    }
+    return normalized, stats
+
 
+def apply_role_mapping(
+    segments: list[dict[str, Any]], mapping: dict[str, str]
+) -> list[dict[str, Any]]:
+    return _map_rows(_analyze(segments)[1], mapping)[0]
 
-def role_stats(segments: list[dict[str, Any]]) -> dict[str, dict[str, float | int]]:
+
+def role_stats(segments: list[dict[str, Any]]) -> RoleStats:
     grouped: dict[str, list[str]] = {ROLE_MODERATOR: [], ROLE_INTERVIEWEE: []}
     for segment in segments:
         role = str(segment.get("role", ROLE_INTERVIEWEE))
@@ -116,7 +174,7 @@ def role_stats(segments: list[dict[str, Any]]) -> dict[str, dict[str, float | in
             continue
         grouped[role].append(str(segment.get("text", "")))
 
-    stats: dict[str, dict[str, float | int]] = {}
+    stats: RoleStats = {}
     for role, texts in grouped.items():
         turns = len(texts)
         chars = sum(len(text) for text in texts)
@@ -130,8 +188,7 @@ def role_stats(segments: list[dict[str, Any]]) -> dict[str, dict[str, float | in
     return stats
 
 
-def gate_two_roles(segments: list[dict[str, Any]]) -> tuple[bool, list[str], dict[str, dict[str, float | int]]]:
-    stats = role_stats(segments)
+def _gate_reasons(stats: RoleStats) -> list[str]:
     reasons: list[str] = []
     for role in (ROLE_MODERATOR, ROLE_INTERVIEWEE):
         turns = int(stats[role]["turns"])
@@ -145,54 +202,92 @@ def gate_two_roles(segments: list[dict[str, Any]]) -> tuple[bool, list[str], dic
     interviewee_q = float(stats[ROLE_INTERVIEWEE]["question_ratio"])
     if moderator_q <= interviewee_q:
         reasons.append("moderator_question_ratio_not_higher")
+    return reasons
+
 
+def gate_two_roles(segments: list[dict[str, Any]]) -> tuple[bool, list[str], RoleStats]:
+    stats = role_stats(segments)
+    reasons = _gate_reasons(stats)
     return len(reasons) == 0, reasons, stats
 
 
+_SAMPLE_SEGMENTS_LAYOUT = (
+    "data.sample_segments is columnar: speaker_ids[i], "
+    "texts[i] and starts[i] describe the i-th sampled segment (texts are truncated, "
+    "verbatim repeats by the same speaker are dropped). "
+)
+_MAPPING_SYSTEM_PROMPT = (
+    "You map diarized speakers in an interview to exactly two roles: "
+    "MODERATOR and INTERVIEWEE. " + _SAMPLE_SEGMENTS_LAYOUT + "Return only JSON object."
+)
+_PACKED_MAPPING_SYSTEM_PROMPT = (
+    "You map diarized speakers in several independent interviews to exactly two roles: "
+    "MODERATOR and INTERVIEWEE. In every task, " + _SAMPLE_SEGMENTS_LAYOUT + "Return only JSON object."
+)
+# The user message is this fixed JSON prefix plus the per-file data, so every request
+# starts with the same bytes (friendly to provider-side prompt caching) and only the
+# data is encoded per call.
+_MAPPING_PROMPT_PREFIX = json.dumps(
+    {
+        "task": "Map every speaker_id to one of MODERATOR or INTERVIEWEE",
+        "constraint": "Exactly one speaker should be MODERATOR when possible.",
+        "output_schema": {"mapping": {"speaker_id": "MODERATOR|INTERVIEWEE"}},
+    },
+    ensure_ascii=False,
+)[:-1] + ', "data": '
+_PACKED_PROMPT_PREFIX = json.dumps(
+    {
+        "task": "For every task, map every speaker_id of its data to one of MODERATOR or INTERVIEWEE",
+        "constraint": "Exactly one speaker per task should be MODERATOR when possible.",
+        "output_schema": {"results": [{"id": "task id", "mapping": {"speaker_id": "MODERATOR|INTERVIEWEE"}}]},
+    },
+    ensure_ascii=False,
+)[:-1] + ', "tasks": ['
+
+
 def _llm_mapping_prompt_payload(
-    *, segments: list[dict[str, Any]], max_segments: int
+    *,
+    segments: list[dict[str, Any]],
+    max_segments: int,
+    speaker_stats: dict[str, dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
-    stats = _speaker_stats(segments)
-    sample = [
-        {
-            "speaker_id": str(item.get("speaker_id") or "unknown"),
-            "text": str(item.get("text", ""))[:220],
-            "start": item.get("start"),
-            "end": item.get("end"),
-        }
-        for item in segments[:max_segments]
-    ]
-    return {"speaker_stats": stats, "sample_segments": sample}
+    stats = speaker_stats if speaker_stats is not None else _speaker_stats(segments)
+    # Parallel arrays instead of one object per segment: the keys are not repeated on
+    # every row. Short texts are enough to tell who asks and who answers.
+    sample: dict[tuple[str, str], Any] = {}
+    for item in segments[:max_segments]:
+        key = (str(item.get("speaker_id") or "unknown"), str(item.get("text", ""))[:160])
+        sample.setdefault(key, item.get("start"))
+    return {
+        "speaker_stats": stats,
+        "sample_segments": {
+            "speaker_ids": [speaker_id for speaker_id, _ in sample],
+            "texts": [text for _, text in sample],
+            "starts": list(sample.values()),
+        },
+    }
 
 
-def llm_mapping(
+def _llm_mapping_messages(
     *,
-    client: MistralClient,
-    model: str,
     segments: list[dict[str, Any]],
     max_segments: int,
-) -> tuple[dict[str, str], str]:
-    payload = _llm_mapping_prompt_payload(segments=segments, max_segments=max_segments)
-    system_prompt = (
-        "You map diarized speakers in an interview to exactly two roles: "
-        "MODERATOR and INTERVIEWEE. Return only JSON object."
+    speaker_stats: dict[str, dict[str, Any]] | None = None,
+) -> list[dict[str, str]]:
+    payload = _llm_mapping_prompt_payload(
+        segments=segments, max_segments=max_segments, speaker_stats=speaker_stats
     )
-    user_prompt = {
-        "task": "Map every speaker_id to one of MODERATOR or INTERVIEWEE",
-        "constraint": "Exactly one speaker should be MODERATOR when possible.",
-        "data": payload,
-        "output_schema": {"mapping": {"speaker_id": "MODERATOR|INTERVIEWEE"}},
-    }
+    return _mapping_messages(payload)
 
-    response = client.chat_json(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": json.dumps(user_prompt, ensure_ascii=False)},
-        ],
-        temperature=0.0,
-        max_tokens=2048,
-    )
+
+def _mapping_messages(payload: dict[str, Any]) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": _MAPPING_SYSTEM_PROMPT},
+        {"role": "user", "content": _MAPPING_PROMPT_PREFIX + json_to_text(payload) + "}"},
+    ]
+
+
+def _parse_mapping(response: dict[str, Any]) -> dict[str, str]:
     mapping_raw = response.get("mapping")
     mapping: dict[str, str] = {}
     if isinstance(mapping_raw, dict):
@@ -202,22 +297,236 @@ def llm_mapping(
             if role_name not in VALID_ROLES:
                 continue
             mapping[speaker_key] = role_name
-    return mapping, "llm"
+    return mapping
+
+
+def _mapping_max_tokens(speaker_count: int) -> int:
+    # The answer is {"mapping": {speaker_id: role}}: a few tokens per speaker, with
+    # headroom for long (chunk-prefixed) speaker ids.
+    return min(MAPPING_MAX_TOKENS, 64 + 32 * max(1, speaker_count))
+
+
+def llm_mapping(
+    *,
+    client: MistralClient,
+    model: str,
+    segments: list[dict[str, Any]],
+    max_segments: int,
+    speaker_stats: dict[str, dict[str, Any]] | None = None,
+) -> tuple[dict[str, str], str]:
+    if speaker_stats is None:
+        speaker_stats = _speaker_stats(segments)
+    response = client.chat_json(
+        model=model,
+        messages=_llm_mapping_messages(
+            segments=segments, max_segments=max_segments, speaker_stats=speaker_stats
+        ),
+        temperature=0.0,
+        max_tokens=_mapping_max_tokens(len(speaker_stats)),
+    )
+    return _parse_mapping(response), "llm"
 
 
-def _sanitize_mapping(mapping: dict[str, str], segments: list[dict[str, Any]]) -> dict[str, str]:
-    speakers = sorted({str(seg.get("speaker_id") or "unknown") for seg in segments})
+def _request_key(messages: list[dict[str, str]]) -> str:
+    return hashlib.blake2b(json_to_text(messages).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BatchMappingResults:
+    """Answers ``chat_json`` from a finished batch job instead of calling the API.
+
+    Responses are keyed by a digest of the request messages, so
+    ``normalize_transcript_entry`` runs unchanged; a request missing from the job
+    output is sent to ``fallback`` when given, otherwise it raises and takes the
+    usual heuristic fallback.
+    """
+
+    def __init__(self, responses: dict[str, str], fallback: MistralClient | None = None) -> None:
+        self.responses = responses
+        self.fallback = fallback
+
+    def chat_json(self, *, messages: list[dict[str, str]], **kwargs: Any) -> dict[str, Any]:
+        raw_text = self.responses.get(_request_key(messages))
+        if raw_text is None:
+            if self.fallback is not None:
+                return self.fallback.chat_json(messages=messages, **kwargs)
+            raise RuntimeError("missing_batch_result")
+        parsed = json_from_text(raw_text)
+        if not isinstance(parsed, dict):
+            raise RuntimeError("Expected JSON object in response")
+        return parsed
+
+
+def run_mapping_batch(
+    client: MistralClient,
+    *,
+    model: str,
+    requests: dict[str, list[dict[str, str]]],
+    input_path: Path,
+    poll_interval: float,
+    timeout_seconds: float,
+) -> dict[str, str]:
+    # One Batch API job for every transcript that needs LLM mapping; returns the raw
+    # completion text per request key. A job that does not finish successfully
+    # returns what it has (possibly nothing) and those files fall back to heuristics.
+    input_path.unlink(missing_ok=True)
+    with JsonlWriter(input_path) as writer:
+        for key, messages in requests.items():
+            writer.write(
+                {
+                    "custom_id": key,
+                    "body": {
+                        "messages": messages,
+                        "temperature": 0.0,
+                        "max_tokens": MAPPING_MAX_TOKENS,
+                        "response_format": {"type": "json_object"},
+                    },
+                }
+            )
+
+    upload = client.upload_file(file_path=input_path, purpose="batch")
+    job = client.create_batch_job(
+        input_file_id=str(upload["id"]),
+        model=model,
+        metadata={"stage": "normalize_speakers"},
+    )
+    job_id = str(job["id"])
+    print(f"[normalize_speakers] batch job id={job_id} requests={len(requests)}")
+
+    deadline = time.time() + timeout_seconds
+    delay = BATCH_MIN_POLL_SECONDS
+    status = str(job.get("status", "")).upper()
+    while status not in BATCH_FINAL_STATUSES and time.time() < deadline:
+        time.sleep(min(delay, max(0.0, deadline - time.time())))
+        delay = min(poll_interval, delay * 2)
+        job = client.get_batch_job(job_id=job_id)
+        status = str(job.get("status", "")).upper()
+    print(f"[normalize_speakers] batch job id={job_id} status={status or 'UNKNOWN'}")
+
+    output_file = job.get("output_file")
+    if not output_file:
+        return {}
+    responses: dict[str, str] = {}
+    for line in client.download_file(file_id=str(output_file)).splitlines():
+        if not line.strip():
+            continue
+        row = json_loads(line)
+        body = (row.get("response") or {}).get("body") or {}
+        choices = body.get("choices") or []
+        if not choices:
+            continue
+        content = (choices[0].get("message") or {}).get("content")
+        if isinstance(content, str):
+            responses[str(row.get("custom_id"))] = content
+    return responses
+
+
+def _pack_payloads(
+    payloads: dict[str, dict[str, Any]], *, pack_size: int
+) -> Iterator[list[tuple[str, str, int]]]:
+    # Groups (request key, encoded data, speaker count) into packs of at most
+    # pack_size tasks and PACK_MAX_CHARS of data.
+    pack: list[tuple[str, str, int]] = []
+    pack_chars = 0
+    for key, payload in payloads.items():
+        data = json_to_text(payload)
+        if pack and (len(pack) >= pack_size or pack_chars + len(data) > PACK_MAX_CHARS):
+            yield pack
+            pack, pack_chars = [], 0
+        pack.append((key, data, len(payload["speaker_stats"])))
+        pack_chars += len(data)
+    if pack:
+        yield pack
+
+
+def run_mapping_packed(
+    client: MistralClient,
+    *,
+    model: str,
+    payloads: dict[str, dict[str, Any]],
+    pack_size: int,
+    workers: int,
+) -> dict[str, str]:
+    # Several files' mapping tasks per chat call; returns the same per-request-key
+    # response text as run_mapping_batch. Tasks missing from an answer (or from a
+    # failed call) are left out, so they get their own call later.
+    def run_pack(pack: list[tuple[str, str, int]]) -> dict[str, str]:
+        tasks = ", ".join(f'{{"id": "{index}", "data": {data}}}' for index, (_, data, _) in enumerate(pack))
+        try:
+            response = client.chat_json(
+                model=model,
+                messages=[
+                    {"role": "system", "content": _PACKED_MAPPING_SYSTEM_PROMPT},
+                    {"role": "user", "content": _PACKED_PROMPT_PREFIX + tasks + "]}"},
+                ],
+                temperature=0.0,
+                max_tokens=min(
+                    MAPPING_MAX_TOKENS * len(pack),
+                    sum(16 + _mapping_max_tokens(speakers) for _, _, speakers in pack),
+                ),
+            )
+        except Exception as err:  # noqa: BLE001
+            print(f"[normalize_speakers] packed mapping failed for {len(pack)} files -> {err}")
+            return {}
+
+        answered: dict[str, str] = {}
+        results = response.get("results")
+        for item in results if isinstance(results, list) else []:
+            if not isinstance(item, dict) or not isinstance(item.get("mapping"), dict):
+                continue
+            index = str(item.get("id", ""))
+            if index.isdigit() and int(index) < len(pack):
+                answered[pack[int(index)][0]] = json_to_text({"mapping": item["mapping"]})
+        return answered
+
+    responses: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for answered in executor.map(run_pack, _pack_payloads(payloads, pack_size=pack_size)):
+            responses.update(answered)
+    return responses
+
+
+def _sanitize_mapping(
+    mapping: dict[str, str],
+    stats: dict[str, dict[str, Any]],
+    *,
+    speakers: list[str] | None = None,
+    fallback: dict[str, str] | None = None,
+) -> dict[str, str]:
+    # speakers (sorted ids) and fallback (the heuristic mapping) can be passed in when
+    # the caller already has them.
+    if speakers is None:
+        speakers = sorted(stats)
     if not speakers:
         return {}
 
     sanitized = {speaker: mapping.get(speaker, ROLE_INTERVIEWEE) for speaker in speakers}
-    moderators = [speaker for speaker, role in sanitized.items() if role == ROLE_MODERATOR]
-    if len(moderators) == 1:
+    if sum(role == ROLE_MODERATOR for role in sanitized.values()) == 1:
         return sanitized
-    fallback = heuristic_mapping(segments)
+    if fallback is None:
+        fallback = _heuristic_from_stats(stats)
     return {speaker: fallback.get(speaker, ROLE_INTERVIEWEE) for speaker in speakers}
 
 
+def _transcript_segments(transcript: dict[str, Any]) -> list[dict[str, Any]]:
+    raw_segments = transcript.get("segments")
+    if isinstance(raw_segments, list):
+        return [item for item in raw_segments if isinstance(item, dict)]
+    return []
+
+
+def _heuristic_result(
+    speaker_stats: dict[str, dict[str, Any]], rows: list[SegmentRow]
+) -> tuple[dict[str, str], list[dict[str, Any]], RoleStats, list[str]]:
+    mapping = _heuristic_from_stats(speaker_stats)
+    mapped_segments, stats = _map_rows(rows, mapping)
+    return mapping, mapped_segments, stats, _gate_reasons(stats)
+
+
+def _needs_llm_mapping(speaker_stats: dict[str, dict[str, Any]], rows: list[SegmentRow]) -> bool:
+    # Three or more speakers only go to the model when the heuristic merge fails the gate.
+    return len(speaker_stats) > 2 and bool(_heuristic_result(speaker_stats, rows)[3])
+
+
 def normalize_transcript_entry(
     *,
     transcript: dict[str, Any],
@@ -225,33 +534,35 @@ def normalize_transcript_entry(
     model: str,
     max_segments_for_llm: int,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
-    raw_segments = transcript.get("segments")
-    segments: list[dict[str, Any]]
-    if isinstance(raw_segments, list):
-        segments = [item for item in raw_segments if isinstance(item, dict)]
-    else:
-        segments = []
-
-    speaker_ids = sorted({str(seg.get("speaker_id") or "unknown") for seg in segments})
+    segments = _transcript_segments(transcript)
+    speaker_stats, rows = _analyze(segments)
+    speaker_ids = sorted(speaker_stats)
     method = "heuristic"
 
-    if len(speaker_ids) <= 2:
-        mapping = heuristic_mapping(segments)
-    else:
+    mapping, mapped_segments, stats, gate_reasons = _heuristic_result(speaker_stats, rows)
+    if len(speaker_ids) > 2 and not gate_reasons:
+        method = "heuristic_three_plus"
+    elif len(speaker_ids) > 2:
         try:
             mapping_llm, method = llm_mapping(
                 client=client,
                 model=model,
                 segments=segments,
                 max_segments=max_segments_for_llm,
+                speaker_stats=speaker_stats,
             )
-            mapping = _sanitize_mapping(mapping_llm, segments)
+            sanitized = _sanitize_mapping(
+                mapping_llm, speaker_stats, speakers=speaker_ids, fallback=mapping
+            )
+            # Segments only need re-mapping when the model disagrees with the heuristic.
+            if sanitized != mapping:
+                mapping = sanitized
+                mapped_segments, stats = _map_rows(rows, mapping)
+                gate_reasons = _gate_reasons(stats)
         except Exception:  # noqa: BLE001
             method = "heuristic_fallback"
-            mapping = heuristic_mapping(segments)
 
-    mapped_segments = apply_role_mapping(segments, mapping)
-    gate_ok, gate_reasons, stats = gate_two_roles(mapped_segments)
+    gate_ok = not gate_reasons
     if len(speaker_ids) > 2 and gate_ok:
         status = "auto_merged"
     elif len(speaker_ids) > 2 and not gate_ok:
@@ -314,14 +625,22 @@ def parse_args() -> argparse.Namespace:
         default=120,
         help="Max segment count sent to LLM for mapping",
     )
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Send all LLM mapping requests as one Batch API job instead of live calls",
+    )
+    parser.add_argument("--batch-poll-interval", type=int, default=60, help="Max batch polling interval seconds")
+    parser.add_argument("--batch-timeout-minutes", type=int, default=24 * 60, help="Batch job timeout in minutes")
+    parser.add_argument(
+        "--pack-size",
+        type=int,
+        default=1,
+        help="Map up to this many files per live chat request (default: 1, ignored with --batch-api)",
+    )
     return parser.parse_args()
 
 
-def _iter_transcript_files(input_dir: Path) -> list[Path]:
-    files = [path for path in input_dir.rglob("*.json") if path.is_file()]
-    return sorted(path for path in files if "/raw/" not in str(path))
-
-
 def _output_path(input_dir: Path, output_dir: Path, input_path: Path) -> Path:
     return output_dir / input_path.relative_to(input_dir)
 
@@ -335,7 +654,7 @@ def main() -> int:
     if not input_dir.exists():
         raise SystemExit(f"Input directory does not exist: {input_dir}")
 
-    transcript_files = _iter_transcript_files(input_dir)
+    transcript_files = collect_transcript_files(input_dir)
     if args.limit > 0:
         transcript_files = transcript_files[: args.limit]
     if not transcript_files:
@@ -354,8 +673,49 @@ def main() -> int:
 
     print(
         f"[normalize_speakers] files={len(transcript_files)} model={args.model} "
-        f"workers={workers} resume={args.resume}"
+        f"workers={workers} resume={args.resume} batch_api={args.batch_api}"
     )
+    max_segments_for_llm = max(20, int(args.max_segments_for_llm))
+    # One pooled client shared by all workers (httpx.Client is thread-safe).
+    client = MistralClient(api_key=api_key, api_base=api_base, max_connections=workers * 2)
+
+    pack_size = max(1, int(args.pack_size))
+    batch_results: BatchMappingResults | None = None
+    if args.batch_api or pack_size > 1:
+        # First pass: collect the mapping request of every file that needs one, run
+        # them as a single batch job (or as packed live calls), then let the workers
+        # below read the answers.
+        requests: dict[str, list[dict[str, str]]] = {}
+        payloads: dict[str, dict[str, Any]] = {}
+        for path in transcript_files:
+            if args.resume and _output_path(input_dir, output_dir, path).exists():
+                continue
+            segments = _transcript_segments(read_json(path))
+            speaker_stats, rows = _analyze(segments)
+            if not _needs_llm_mapping(speaker_stats, rows):
+                continue
+            payload = _llm_mapping_prompt_payload(
+                segments=segments, max_segments=max_segments_for_llm, speaker_stats=speaker_stats
+            )
+            messages = _mapping_messages(payload)
+            key = _request_key(messages)
+            requests[key] = messages
+            payloads[key] = payload
+        responses: dict[str, str] = {}
+        if requests and not args.batch_api:
+            responses = run_mapping_packed(
+                client, model=args.model, payloads=payloads, pack_size=pack_size, workers=workers
+            )
+        elif requests:
+            responses = run_mapping_batch(
+                client,
+                model=args.model,
+                requests=requests,
+                input_path=manifest_path.with_name("normalize_speakers_batch_input.jsonl"),
+                poll_interval=max(BATCH_MIN_POLL_SECONDS, int(args.batch_poll_interval)),
+                timeout_seconds=max(1, int(args.batch_timeout_minutes)) * 60,
+            )
+        batch_results = BatchMappingResults(responses, fallback=None if args.batch_api else client)
 
     def run(path: Path) -> dict[str, Any]:
         out_path = _output_path(input_dir, output_dir, path)
@@ -368,13 +728,12 @@ def main() -> int:
                 "updated_at": now_iso(),
             }
 
-        transcript = json.loads(path.read_text(encoding="utf-8"))
-        client = MistralClient(api_key=api_key, api_base=api_base)
+        transcript = read_json(path)
         normalized, record = normalize_transcript_entry(
             transcript=transcript,
-            client=client,
+            client=batch_results or client,
             model=args.model,
-            max_segments_for_llm=max(20, int(args.max_segments_for_llm)),
+            max_segments_for_llm=max_segments_for_llm,
         )
         ensure_parent(out_path)
         write_json(out_path, normalized)
@@ -382,7 +741,11 @@ def main() -> int:
         record["output_path"] = str(out_path.resolve())
         return record
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
+    with (
+        client,
+        JsonlWriter(manifest_path) as manifest_writer,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
         future_map = {executor.submit(run, path): path for path in transcript_files}
         for future in as_completed(future_map):
             path = future_map[future]
@@ -404,7 +767,7 @@ def main() -> int:
                     counters[status] = 0
                 counters[status] += 1
                 print(f"[normalize_speakers] {status}: {path.name}")
-            append_jsonl(manifest_path, record)
+            manifest_writer.write(record)
 
     print(
         "[normalize_speakers] done "
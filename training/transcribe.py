@@ -1,66 +1,88 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import shutil
 import subprocess
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
 try:
     from .common import (
+        JsonlWriter,
+        MistralAPIError,
         MistralClient,
-        append_jsonl,
-        collect_audio_files,
         ensure_parent,
         get_mistral_config,
+        iter_audio_files,
         now_iso,
+        read_json,
         write_json,
     )
 except ImportError:  # pragma: no cover - direct script execution
     from common import (  # type: ignore
+        JsonlWriter,
+        MistralAPIError,
         MistralClient,
-        append_jsonl,
-        collect_audio_files,
         ensure_parent,
         get_mistral_config,
+        iter_audio_files,
         now_iso,
+        read_json,
         write_json,
     )
 
 
+# Auth, unknown model and invalid parameter errors fail the same way for every chunk.
+UNCHUNKABLE_STATUS_CODES = {401, 403, 404, 422}
+
+
+def _normalize_segment(index: int, item: dict[str, Any]) -> dict[str, Any]:
+    try:
+        start = float(item.get("start", 0.0))
+    except (TypeError, ValueError):
+        start = 0.0
+    try:
+        end = float(item.get("end", start))
+    except (TypeError, ValueError):
+        end = start
+
+    speaker = item.get("speaker_id")
+    return {
+        "index": index,
+        "start": start,
+        "end": end,
+        "text": str(item.get("text", "")).strip(),
+        "speaker_id": None if speaker is None else str(speaker).strip() or None,
+        "score": item.get("score"),
+    }
+
+
 def normalize_transcription_response(
-    *, raw: dict[str, Any], audio_path: Path, model: str, diarize: bool
+    *,
+    raw: dict[str, Any],
+    audio_path: Path,
+    model: str,
+    diarize: bool,
+    audio_path_str: str | None = None,
 ) -> dict[str, Any]:
     segments_payload = raw.get("segments")
     segments: list[dict[str, Any]] = []
+    speaker_set: set[str] = set()
 
     if isinstance(segments_payload, list):
+        # Speaker ids are collected in the same pass that builds the segments.
         for index, item in enumerate(segments_payload):
             if not isinstance(item, dict):
                 continue
-            try:
-                start = float(item.get("start", 0.0))
-            except (TypeError, ValueError):
-                start = 0.0
-            try:
-                end = float(item.get("end", start))
-            except (TypeError, ValueError):
-                end = start
-
-            speaker = item.get("speaker_id")
-            speaker_id = None if speaker is None else str(speaker).strip() or None
-            segments.append(
-                {
-                    "index": index,
-                    "start": start,
-                    "end": end,
-                    "text": str(item.get("text", "")).strip(),
-                    "speaker_id": speaker_id,
-                    "score": item.get("score"),
-                }
-            )
+            segment = _normalize_segment(index, item)
+            if segment["speaker_id"]:
+                speaker_set.add(segment["speaker_id"])
+            segments.append(segment)
 
     text = str(raw.get("text", "")).strip()
     if not segments and text:
@@ -78,18 +100,17 @@ def normalize_transcription_response(
     usage = raw.get("usage")
     usage_payload = usage if isinstance(usage, dict) else {}
 
-    speaker_ids = sorted({seg["speaker_id"] for seg in segments if seg.get("speaker_id")})
     language = str(raw.get("language") or raw.get("audio_language") or "").strip() or None
 
     return {
-        "audio_path": str(audio_path.resolve()),
+        "audio_path": audio_path_str or str(audio_path.resolve()),
         "audio_filename": audio_path.name,
         "model": model,
         "diarize": diarize,
         "language": language,
         "text": text,
         "segments": segments,
-        "speaker_ids": speaker_ids,
+        "speaker_ids": sorted(speaker_set),
         "usage": usage_payload,
         "transcribed_at": now_iso(),
     }
@@ -110,45 +131,54 @@ def _probe_duration_seconds(audio_path: Path) -> float:
         "-show_entries",
         "format=duration",
         "-of",
-        "csv=p=0",
+        "default=nw=1:nk=1",
         str(audio_path),
     ]
     result = subprocess.run(cmd, check=True, capture_output=True, text=True)
     return float(result.stdout.strip() or "0")
 
 
-def _split_audio_chunks(audio_path: Path, chunk_seconds: int) -> tuple[list[tuple[Path, float]], Path | None]:
-    duration = _probe_duration_seconds(audio_path)
+def _fit_chunk_seconds(audio_path: Path, *, file_size_mb: float, max_upload_mb: int, chunk_seconds: int) -> int:
+    # Shortens chunks so each one stays near 80% of --max-upload-mb at the file's
+    # average bitrate; --chunk-seconds remains the upper bound.
+    try:
+        duration = _probe_duration_seconds(audio_path)
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return chunk_seconds
     if duration <= 0:
-        return [(audio_path, 0.0)], None
-
-    chunk_paths: list[tuple[Path, float]] = []
-    temp_dir = tempfile.mkdtemp(prefix="voxtral_chunks_")
-    start = 0.0
-    index = 0
-    while start < duration:
-        out_path = Path(temp_dir) / f"{audio_path.stem}.chunk{index:03d}{audio_path.suffix}"
-        cmd = [
-            "ffmpeg",
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-y",
-            "-ss",
-            str(start),
-            "-t",
-            str(chunk_seconds),
-            "-i",
-            str(audio_path),
-            "-c",
-            "copy",
-            str(out_path),
-        ]
-        subprocess.run(cmd, check=True)
-        chunk_paths.append((out_path, start))
-        start += chunk_seconds
-        index += 1
-    return chunk_paths, Path(temp_dir)
+        return chunk_seconds
+    mb_per_second = file_size_mb / duration
+    return max(60, min(chunk_seconds, int(0.8 * max_upload_mb / mb_per_second)))
+
+
+def _split_audio_chunks(audio_path: Path, chunk_seconds: int) -> tuple[list[tuple[Path, float]], Path | None]:
+    # One ffmpeg segmenter pass writes every chunk (stream copy, so no re-encode)
+    # instead of one seek-and-copy process per chunk. Chunk i starts at
+    # i * chunk_seconds.
+    temp_dir = Path(tempfile.mkdtemp(prefix="voxtral_chunks_"))
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(audio_path),
+        "-f",
+        "segment",
+        "-segment_time",
+        str(chunk_seconds),
+        "-reset_timestamps",
+        "1",
+        "-c",
+        "copy",
+        str(temp_dir / f"{audio_path.stem}.chunk%03d{audio_path.suffix}"),
+    ]
+    subprocess.run(cmd, check=True)
+    chunk_files = sorted(temp_dir.glob(f"{audio_path.stem}.chunk*{audio_path.suffix}"))
+    if not chunk_files:
+        return [(audio_path, 0.0)], temp_dir
+    return [(path, float(index * chunk_seconds)) for index, path in enumerate(chunk_files)], temp_dir
 
 
 def _merge_chunked_transcriptions(
@@ -157,6 +187,7 @@ def _merge_chunked_transcriptions(
     audio_path: Path,
     model: str,
     diarize: bool,
+    audio_path_str: str | None = None,
 ) -> dict[str, Any]:
     merged_segments: list[dict[str, Any]] = []
     texts: list[str] = []
@@ -178,39 +209,20 @@ def _merge_chunked_transcriptions(
             if isinstance(value, int):
                 prompt_audio_seconds += value
 
+        # Chunk segments come straight from normalize_transcription_response (already
+        # coerced, and owned by this merge), so they are shifted and relabelled in place.
         for segment in normalized.get("segments", []):
-            if not isinstance(segment, dict):
-                continue
-            try:
-                start = float(segment.get("start", 0.0)) + offset
-            except (TypeError, ValueError):
-                start = offset
-            try:
-                end = float(segment.get("end", start)) + offset
-            except (TypeError, ValueError):
-                end = start
-
-            source_speaker = segment.get("speaker_id")
-            if source_speaker is None:
-                speaker = None
-            else:
-                speaker = f"chunk{chunk_idx}:{str(source_speaker).strip()}"
-                speaker_ids.add(speaker)
-
-            merged_segments.append(
-                {
-                    "index": segment_index,
-                    "start": start,
-                    "end": end,
-                    "text": str(segment.get("text", "")).strip(),
-                    "speaker_id": speaker,
-                    "score": segment.get("score"),
-                }
-            )
+            segment["index"] = segment_index
+            segment["start"] += offset
+            segment["end"] += offset
+            if segment["speaker_id"] is not None:
+                segment["speaker_id"] = f"chunk{chunk_idx}:{segment['speaker_id']}"
+                speaker_ids.add(segment["speaker_id"])
+            merged_segments.append(segment)
             segment_index += 1
 
     return {
-        "audio_path": str(audio_path.resolve()),
+        "audio_path": audio_path_str or str(audio_path.resolve()),
         "audio_filename": audio_path.name,
         "model": model,
         "diarize": diarize,
@@ -225,6 +237,46 @@ def _merge_chunked_transcriptions(
     }
 
 
+def _cache_path(
+    cache_dir: Path,
+    audio_path: Path,
+    *,
+    model: str,
+    diarize: bool,
+    language: str | None,
+    timestamp_granularities: list[str],
+) -> Path:
+    # Keyed by the audio bytes plus every request setting that changes the output, so
+    # re-uploaded or copied files are only transcribed once.
+    with audio_path.open("rb") as fh:
+        digest = hashlib.file_digest(fh, "sha256").hexdigest()
+    settings = f"{model}|{diarize}|{language or ''}|{','.join(timestamp_granularities)}"
+    settings_key = hashlib.blake2b(settings.encode("utf-8"), digest_size=8).hexdigest()
+    return cache_dir / digest[:2] / f"{digest}.{settings_key}.json"
+
+
+def _skipped_record(audio_path_str: str, normalized_path: Path, raw_path: Path, model: str) -> dict[str, Any]:
+    return {
+        "stage": "transcribe",
+        "status": "skipped_existing",
+        "audio_path": audio_path_str,
+        "output_path": str(normalized_path.resolve()),
+        "raw_output_path": str(raw_path.resolve()),
+        "model": model,
+        "updated_at": now_iso(),
+    }
+
+
+def _call_transcribe(
+    client: MistralClient, request_slots: threading.BoundedSemaphore | None, **kwargs: Any
+) -> dict[str, Any]:
+    # request_slots caps in-flight API calls across file workers and their chunk workers.
+    if request_slots is None:
+        return client.transcribe(**kwargs)
+    with request_slots:
+        return client.transcribe(**kwargs)
+
+
 def _transcribe_one(
     *,
     client: MistralClient,
@@ -238,22 +290,52 @@ def _transcribe_one(
     timestamp_granularities: list[str],
     max_upload_mb: int,
     chunk_seconds: int,
+    cache_dir: Path | None = None,
+    chunk_concurrency: int = 1,
+    request_slots: threading.BoundedSemaphore | None = None,
 ) -> dict[str, Any]:
     normalized_path, raw_path = _output_paths(input_dir, output_dir, audio_path)
+    # Resolved once per file and reused for every record and output below.
+    audio_path_str = str(audio_path.resolve())
     if resume and normalized_path.exists() and raw_path.exists():
-        return {
-            "stage": "transcribe",
-            "status": "skipped_existing",
-            "audio_path": str(audio_path.resolve()),
-            "output_path": str(normalized_path.resolve()),
-            "raw_output_path": str(raw_path.resolve()),
-            "model": model,
-            "updated_at": now_iso(),
-        }
+        return _skipped_record(audio_path_str, normalized_path, raw_path, model)
 
     file_size_mb = audio_path.stat().st_size / (1024 * 1024)
     force_chunk = file_size_mb > max_upload_mb
 
+    cache_path: Path | None = None
+    if cache_dir is not None:
+        cache_path = _cache_path(
+            cache_dir,
+            audio_path,
+            model=model,
+            diarize=diarize,
+            language=language,
+            timestamp_granularities=timestamp_granularities,
+        )
+        if cache_path.exists():
+            cached = read_json(cache_path)
+            normalized = dict(cached["normalized"])
+            normalized["audio_path"] = audio_path_str
+            normalized["audio_filename"] = audio_path.name
+            ensure_parent(normalized_path)
+            ensure_parent(raw_path)
+            write_json(normalized_path, normalized)
+            write_json(raw_path, cached["raw"])
+            return {
+                "stage": "transcribe",
+                "status": "cache_hit",
+                "audio_path": audio_path_str,
+                "output_path": str(normalized_path.resolve()),
+                "raw_output_path": str(raw_path.resolve()),
+                "model": model,
+                "cache_path": str(cache_path),
+                "file_size_mb": round(file_size_mb, 2),
+                "language": normalized.get("language"),
+                "segments": len(normalized.get("segments", [])),
+                "updated_at": now_iso(),
+            }
+
     normalized: dict[str, Any]
     raw: dict[str, Any] | list[dict[str, Any]]
     used_chunking = False
@@ -264,7 +346,9 @@ def _transcribe_one(
             raise RuntimeError(
                 f"File size {file_size_mb:.1f}MB exceeds --max-upload-mb={max_upload_mb}, switching to chunked mode"
             )
-        raw = client.transcribe(
+        raw = _call_transcribe(
+            client,
+            request_slots,
             model=model,
             audio_file=audio_path,
             diarize=diarize,
@@ -276,21 +360,38 @@ def _transcribe_one(
             audio_path=audio_path,
             model=model,
             diarize=diarize,
+            audio_path_str=audio_path_str,
         )
-    except Exception:  # noqa: BLE001
+    except Exception as err:  # noqa: BLE001
+        # Transient failures were already retried with backoff inside MistralClient;
+        # errors that smaller uploads cannot fix skip the ffmpeg fallback.
+        if isinstance(err, MistralAPIError) and err.status_code in UNCHUNKABLE_STATUS_CODES:
+            raise
         used_chunking = True
         raw_chunks: list[dict[str, Any]] = []
         normalized_chunks: list[tuple[dict[str, Any], float, int]] = []
         try:
-            chunk_paths, chunk_temp_dir = _split_audio_chunks(audio_path, chunk_seconds)
-            for chunk_idx, (chunk_path, offset) in enumerate(chunk_paths):
-                chunk_raw = client.transcribe(
-                    model=model,
-                    audio_file=chunk_path,
-                    diarize=diarize,
-                    timestamp_granularities=timestamp_granularities,
-                    language=language,
-                )
+            fitted_seconds = _fit_chunk_seconds(
+                audio_path, file_size_mb=file_size_mb, max_upload_mb=max_upload_mb, chunk_seconds=chunk_seconds
+            )
+            chunk_paths, chunk_temp_dir = _split_audio_chunks(audio_path, fitted_seconds)
+            # Chunks are uploaded concurrently; results are collected in chunk order.
+            with ThreadPoolExecutor(max_workers=max(1, min(chunk_concurrency, len(chunk_paths)))) as executor:
+                futures = [
+                    executor.submit(
+                        _call_transcribe,
+                        client,
+                        request_slots,
+                        model=model,
+                        audio_file=chunk_path,
+                        diarize=diarize,
+                        timestamp_granularities=timestamp_granularities,
+                        language=language,
+                    )
+                    for chunk_path, _ in chunk_paths
+                ]
+                chunk_raws = [future.result() for future in futures]
+            for chunk_idx, ((chunk_path, offset), chunk_raw) in enumerate(zip(chunk_paths, chunk_raws)):
                 raw_chunks.append(
                     {
                         "chunk_index": chunk_idx,
@@ -303,6 +404,7 @@ def _transcribe_one(
                     audio_path=chunk_path,
                     model=model,
                     diarize=diarize,
+                    audio_path_str=str(chunk_path),
                 )
                 normalized_chunks.append((chunk_norm, offset, chunk_idx))
         finally:
@@ -315,16 +417,19 @@ def _transcribe_one(
             audio_path=audio_path,
             model=model,
             diarize=diarize,
+            audio_path_str=audio_path_str,
         )
 
     ensure_parent(normalized_path)
     ensure_parent(raw_path)
     write_json(normalized_path, normalized)
     write_json(raw_path, raw)
+    if cache_path is not None:
+        write_json(cache_path, {"normalized": normalized, "raw": raw})
     return {
         "stage": "transcribe",
         "status": "success",
-        "audio_path": str(audio_path.resolve()),
+        "audio_path": audio_path_str,
         "output_path": str(normalized_path.resolve()),
         "raw_output_path": str(raw_path.resolve()),
         "model": model,
@@ -366,6 +471,12 @@ def parse_args() -> argparse.Namespace:
         default=900,
         help="Chunk size in seconds for fallback mode (default: 900)",
     )
+    parser.add_argument(
+        "--chunk-concurrency",
+        type=int,
+        default=4,
+        help="Chunks of one file transcribed in parallel in fallback mode (default: 4)",
+    )
     parser.add_argument(
         "--timestamp-granularity",
         action="append",
@@ -378,6 +489,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Disable diarization (enabled by default)",
     )
+    parser.add_argument(
+        "--cache-dir",
+        default="",
+        help="Optional directory caching transcriptions by audio content hash (off by default)",
+    )
     return parser.parse_args()
 
 
@@ -390,15 +506,15 @@ def main() -> int:
     if not input_dir.exists():
         raise SystemExit(f"Input directory does not exist: {input_dir}")
 
-    files = collect_audio_files(input_dir)
-    if args.limit > 0:
-        files = files[: args.limit]
+    # The walk stops as soon as --limit files are found.
+    files = list(islice(iter_audio_files(input_dir), args.limit if args.limit > 0 else None))
     if not files:
         raise SystemExit("No audio files found in input directory")
 
     diarize = not args.no_diarize
     timestamp_granularities = args.timestamp_granularities or ["segment"]
     language = args.language.strip() or None
+    cache_dir = Path(args.cache_dir).expanduser().resolve() if args.cache_dir else None
 
     api_key, api_base = get_mistral_config()
     workers = max(1, int(args.concurrency))
@@ -407,10 +523,29 @@ def main() -> int:
         f"workers={workers} resume={args.resume}"
     )
 
-    counters = {"success": 0, "skipped_existing": 0, "failed": 0}
+    counters = {"success": 0, "cache_hit": 0, "skipped_existing": 0, "failed": 0}
+    # Finished files are filtered out here, before any work is submitted for them.
+    skipped: list[dict[str, Any]] = []
+    if args.resume:
+        pending: list[Path] = []
+        for audio_path in files:
+            normalized_path, raw_path = _output_paths(input_dir, output_dir, audio_path)
+            if normalized_path.exists() and raw_path.exists():
+                audio_path_str = str(audio_path.resolve())
+                skipped.append(_skipped_record(audio_path_str, normalized_path, raw_path, args.model))
+            else:
+                pending.append(audio_path)
+        files = pending
+        counters["skipped_existing"] = len(skipped)
+    # Largest (roughly longest) files first, so a long recording does not start last
+    # and leave the other workers idle at the end of the run.
+    files.sort(key=lambda path: path.stat().st_size, reverse=True)
+    # One pooled client shared by all workers (httpx.Client is thread-safe).
+    client = MistralClient(api_key=api_key, api_base=api_base, max_connections=workers * 2)
+    # Chunk workers share the --concurrency budget with file workers.
+    request_slots = threading.BoundedSemaphore(workers)
 
     def run(audio_path: Path) -> dict[str, Any]:
-        client = MistralClient(api_key=api_key, api_base=api_base)
         return _transcribe_one(
             client=client,
             input_dir=input_dir,
@@ -419,40 +554,61 @@ def main() -> int:
             model=args.model,
             diarize=diarize,
             language=language,
-            resume=args.resume,
+            resume=False,  # already filtered above
             timestamp_granularities=timestamp_granularities,
             max_upload_mb=max(1, int(args.max_upload_mb)),
             chunk_seconds=max(60, int(args.chunk_seconds)),
+            cache_dir=cache_dir,
+            chunk_concurrency=max(1, int(args.chunk_concurrency)),
+            request_slots=request_slots,
         )
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_map = {executor.submit(run, audio_path): audio_path for audio_path in files}
-        for future in as_completed(future_map):
-            audio_path = future_map[future]
-            try:
-                record = future.result()
-            except Exception as err:  # noqa: BLE001
-                counters["failed"] += 1
-                record = {
-                    "stage": "transcribe",
-                    "status": "failed",
-                    "audio_path": str(audio_path.resolve()),
-                    "model": args.model,
-                    "error": str(err),
-                    "updated_at": now_iso(),
-                }
-                print(f"[transcribe] failed: {audio_path.name} -> {err}")
-            else:
-                status = str(record.get("status", "unknown"))
-                if status in counters:
-                    counters[status] += 1
-                print(f"[transcribe] {status}: {audio_path.name}")
-
-            append_jsonl(manifest_path, record)
+    def record_result(future: Future[dict[str, Any]], audio_path: Path, manifest_writer: JsonlWriter) -> None:
+        try:
+            record = future.result()
+        except Exception as err:  # noqa: BLE001
+            counters["failed"] += 1
+            record = {
+                "stage": "transcribe",
+                "status": "failed",
+                "audio_path": str(audio_path.resolve()),
+                "model": args.model,
+                "error": str(err),
+                "updated_at": now_iso(),
+            }
+            print(f"[transcribe] failed: {audio_path.name} -> {err}")
+        else:
+            status = str(record.get("status", "unknown"))
+            if status in counters:
+                counters[status] += 1
+            print(f"[transcribe] {status}: {audio_path.name}")
+
+        manifest_writer.write(record)
+
+    # Files are submitted lazily: at most workers*2 futures are in flight, so the
+    # executor queue stays small however many files there are.
+    max_inflight = workers * 2
+    with (
+        client,
+        JsonlWriter(manifest_path) as manifest_writer,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        for record in skipped:
+            manifest_writer.write(record)
+        inflight: dict[Future[dict[str, Any]], Path] = {}
+        for audio_path in files:
+            if len(inflight) >= max_inflight:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_result(future, inflight.pop(future), manifest_writer)
+            inflight[executor.submit(run, audio_path)] = audio_path
+        for future in as_completed(inflight):
+            record_result(future, inflight[future], manifest_writer)
 
     print(
         "[transcribe] done "
-        f"success={counters['success']} skipped={counters['skipped_existing']} failed={counters['failed']}"
+        f"success={counters['success']} cache_hit={counters['cache_hit']} "
+        f"skipped={counters['skipped_existing']} failed={counters['failed']}"
     )
     return 0 if counters["failed"] == 0 else 1
 